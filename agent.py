@@ -9,15 +9,29 @@ This module implements a LangGraph-based AI agent that:
 
 import os
 import json
+import time
+import uuid
 import logging
-from typing import TypedDict, Annotated, Literal
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypedDict, Annotated, Literal
 from pathlib import Path
 
-from fastmcp import Client as FastMCPClient
 from dotenv import load_dotenv
-from langgraph.graph import StateGraph, END
 import asyncio
 
+from chunking import chunk_text, read_text_capped
+from job_history import content_hash
+from load_balancer import EndpointPool, parse_endpoints
+from logging_config import current_job_id, job_context, truncate_payload
+from output_sinks import MCPOutputSink
+from tool_batcher import ToolBatcher
+
+# fastmcp and langgraph are slow to import; they are loaded on first tool
+# call and first graph build so that startup and health checks stay fast.
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+
 # Load environment variables
 load_dotenv()
 
@@ -29,74 +43,296 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_BASE_RESUME_PATH = os.path.join(os.path.dirname(__file__), "resume_base.md")
+
+
+@dataclass(frozen=True)
+class ResumeProfile:
+    """A candidate profile: its name (used as the output prefix) and base resume."""
+    name: str
+    base_resume_path: str
+
+
+DEFAULT_PROFILES = (ResumeProfile("Gaston_M_Cuellar", DEFAULT_BASE_RESUME_PATH),)
+
+
+def parse_resume_profiles(value: str | None) -> tuple[ResumeProfile, ...]:
+    """
+    Parse resume profiles from a "name=path,name=path" string.
+    
+    Args:
+        value: Profile specification, e.g. from the RESUME_PROFILES variable
+        
+    Returns:
+        The configured profiles, or DEFAULT_PROFILES if value is empty
+    """
+    if not value or not value.strip():
+        return DEFAULT_PROFILES
+    
+    profiles = []
+    for entry in value.split(","):
+        name, sep, path = entry.partition("=")
+        name, path = name.strip(), path.strip()
+        if not sep or not name or not path:
+            raise ValueError(f"Invalid resume profile {entry!r}, expected name=path")
+        profiles.append(ResumeProfile(name, path))
+    
+    names = [profile.name for profile in profiles]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate resume profile names: {names}")
+    return tuple(profiles)
+
+
+def _merge_dicts(left: dict, right: dict) -> dict:
+    """Reducer that merges dict updates from parallel graph branches."""
+    return {**left, **right}
+
+
 class AgentState(TypedDict):
     """State for the TuneIt AI agent."""
+    job_id: str
     job_description_path: str
     job_description_content: str
     formatted_job_description: str
-    tailored_resume: str
+    # Keyed by profile name; filled in parallel by one branch per profile
+    tailored_resumes: Annotated[dict[str, str], _merge_dicts]
+    profile_errors: Annotated[dict[str, str], _merge_dicts]
+    # Hash of the base resume each profile's resume was generated from
+    base_resume_hashes: Annotated[dict[str, str], _merge_dicts]
     status: str
     error: str | None
+    # Set when the job completed on partial input (e.g. truncated)
+    warning: str | None
+
+
+class ProfileState(TypedDict):
+    """Input of a single tailoring branch."""
+    job_id: str
+    profile: ResumeProfile
+    formatted_job_description: str
+
+
+def _is_connect_error(error: BaseException) -> bool:
+    """Return True if error (or an error it wraps) means no connection was made."""
+    import httpx
+
+    seen = set()
+    pending = [error]
+    while pending:
+        error = pending.pop()
+        if error is None or id(error) in seen:
+            continue
+        seen.add(id(error))
+        if isinstance(error, (httpx.ConnectError, ConnectionRefusedError)):
+            return True
+        if isinstance(error, BaseExceptionGroup):
+            pending.extend(error.exceptions)
+        pending.extend((error.__cause__, error.__context__))
+    return False
 
 
 class MCPClient:
     """Client for interacting with MCP server using fastmcp."""
 
-    def __init__(self, base_url: str):
+    # Server-side tool that runs a list of calls to another tool
+    BATCH_TOOL = "batch"
+
+    def __init__(
+        self,
+        base_url: str,
+        batch_window_ms: float = 0,
+        batch_max_size: int = 8,
+        batch_tools: tuple[str, ...] = ("format_to_markdown", "tailor_resume"),
+        token_budget=None,
+        routing: str = "least_outstanding",
+        sticky_sessions: bool = True,
+        eject_failures: int = 3,
+        eject_seconds: float = 30.0,
+        health_interval: float = 10.0,
+    ):
         """
         Initialize MCP client.
         Args:
-            base_url: Base URL of the MCP server (e.g., http://localhost:8000)
+            base_url: Base URL of the MCP server (e.g., http://localhost:8000),
+                or several comma-separated URLs (or a list) to balance across
+            batch_window_ms: How long concurrent calls to a batched tool wait
+                for each other (0 disables batching)
+            batch_max_size: Maximum number of calls sent in one batch
+            batch_tools: Tools whose concurrent calls are batched
+            token_budget: TokenBudget that admits calls to LLM-backed tools
+                (optional)
+            routing: "least_outstanding" or "latency" endpoint selection
+            sticky_sessions: Send a job's calls to the same endpoint
+            eject_failures: Consecutive failed calls that eject an endpoint
+            eject_seconds: Minimum time an ejected endpoint stays out
+            health_interval: Seconds between endpoint health probes (0 = off)
         """
-        self.base_url = base_url.rstrip('/')
-        self.client = FastMCPClient(self.base_url)
+        urls = parse_endpoints(base_url)
+        self.base_url = ",".join(urls)
+        self.pool = EndpointPool(
+            urls,
+            strategy=routing,
+            eject_failures=eject_failures,
+            eject_seconds=eject_seconds,
+            health_interval=health_interval,
+            sticky_sessions=sticky_sessions
+        )
+        self._batchers = {}
+        self.token_budget = token_budget
+        if batch_window_ms > 0:
+            for tool_name in batch_tools:
+                self._batchers[tool_name] = ToolBatcher(
+                    tool_name,
+                    send_single=lambda arguments, name=tool_name: asyncio.run(
+                        self.call_tool(name, arguments)
+                    ),
+                    send_batch=lambda calls, name=tool_name: self._call_batch(name, calls),
+                    window_ms=batch_window_ms,
+                    max_size=batch_max_size
+                )
         logger.info(f"Initialized MCP client with base URL: {self.base_url}")
 
-    async def call_tool(self, tool_name: str, arguments: dict) -> dict:
+    def client_for(self, url: str):
+        """
+        Create a fastmcp Client for an endpoint.
+        
+        Each call opens its own client: calls run on short-lived threads
+        (LangGraph branches, chunk pools, batch dispatch), each with its own
+        event loop, so a client cached per thread would outlive its thread.
+        """
+        from fastmcp import Client as FastMCPClient
+
+        return FastMCPClient(url)
+
+    async def call_tool(self, tool_name: str, arguments: dict, session: str | None = None) -> dict:
         """
         Call an MCP tool via fastmcp Client.
+        
+        If the chosen endpoint could not be reached, so the request was never
+        sent, the call is retried once on each other endpoint. Failures after
+        the request may have reached the server (e.g. read timeouts) are not
+        retried, since the tools are not idempotent. Retries are not charged
+        to the token budget again: only one request is ever sent, and _call
+        already admitted it.
         Args:
             tool_name: Name of the tool to call
             arguments: Arguments to pass to the tool
+            session: Session key (job ID) for sticky endpoint routing
         Returns:
             Tool execution result
         """
+        from fastmcp.exceptions import ToolError
+
         logger.info(f"Calling MCP tool: {tool_name}")
-        logger.debug(f"Arguments: {arguments}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Arguments: %s",
+                {key: truncate_payload(value) for key, value in arguments.items()}
+            )
+        failed = set()
+        while True:
+            endpoint = self.pool.acquire(session, exclude=failed)
+            start = time.perf_counter()
+            connected = False
+            try:
+                # fastmcp Client supports both sync and async, use sync for compatibility
+                result = None
+                async with self.client_for(endpoint.url) as client:
+                    connected = True
+                    result =  await client.call_tool(tool_name, arguments)
+                    output = result.content[0].text if result.content else ""
+            except ToolError as e:
+                # The endpoint answered; the tool itself failed
+                self.pool.release(endpoint, time.perf_counter() - start, ok=True)
+                logger.error(f"Error calling tool {tool_name}: {e}")
+                raise
+            except Exception as e:
+                self.pool.release(endpoint, time.perf_counter() - start, ok=False)
+                failed.add(endpoint.url)
+                never_sent = not connected or _is_connect_error(e)
+                if never_sent and len(failed) < len(self.pool.endpoints):
+                    logger.warning(f"Tool {tool_name} failed on {endpoint.url}: {e}; "
+                                   f"retrying on another endpoint")
+                    continue
+                logger.error(f"Error calling tool {tool_name}: {e}")
+                raise
+            self.pool.release(endpoint, time.perf_counter() - start, ok=True)
+            logger.info(f"Tool {tool_name} executed successfully")
+            return output
+
+    def _call_batch(self, tool_name: str, calls: list[dict]) -> list:
+        """
+        Run several calls to one tool through the server's batch tool.
+        
+        The batch tool returns a JSON list (or {"results": [...]}) with one
+        entry per call: the text the tool returns for that call alone, or
+        {"error": message}. Entries of any other shape become errors for
+        their caller, so batched and unbatched callers always get text.
+        """
+        output = asyncio.run(
+            self.call_tool(self.BATCH_TOOL, {"tool": tool_name, "calls": calls})
+        )
+        results = json.loads(output)
+        if isinstance(results, dict):
+            results = results["results"]
+        return [
+            result if isinstance(result, str) or (isinstance(result, dict) and "error" in result)
+            else {"error": f"Batch {tool_name} returned a {type(result).__name__}, "
+                           f"expected text"}
+            for result in results
+        ]
+
+    def _call(self, tool_name: str, params: dict, session: str | None = None):
+        """Call a tool, through its batcher when batching is enabled for it."""
+        budget = self.token_budget
+        if budget is None or not budget.applies_to(tool_name):
+            return self._send(tool_name, params, session)
+        
+        input_tokens, projected = budget.admit(tool_name, params)
+        output = ""
         try:
-            # fastmcp Client supports both sync and async, use sync for compatibility
-            result = None
-            async with self.client as client:
-                result =  await client.call_tool(tool_name, arguments)
-                output = result.content[0].text if result.content else ""
-                
-                logger.info(f"Tool {tool_name} executed successfully")
-                return output
-            
-        except Exception as e:
-            logger.error(f"Error calling tool {tool_name}: {e}")
-            raise
+            output = self._send(tool_name, params, session)
+            return output
+        finally:
+            budget.record(input_tokens, projected, output)
+
+    def _send(self, tool_name: str, params: dict, session: str | None = None):
+        """Send a tool call, batched if enabled for the tool."""
+        batcher = self._batchers.get(tool_name)
+        if batcher is not None:
+            # A batch mixes jobs, so it is routed without a session
+            return batcher.submit(params)
+        return asyncio.run(self.call_tool(tool_name, params, session))
+
+    def batch_stats(self) -> list[dict]:
+        """Return batch counters and fill rates for each batched tool."""
+        return [batcher.stats() for batcher in self._batchers.values()]
+
+    def endpoint_stats(self) -> list[dict]:
+        """Return health, load and latency for each MCP endpoint."""
+        return self.pool.stats()
     
-    def format_job_description(self, job_description: str) -> dict:
+    def format_job_description(self, job_description: str, session: str | None = None) -> dict:
         """Format a job description using MCP tool."""
         params = {"job_description": job_description}
         
-        return asyncio.run(self.call_tool("format_to_markdown", params))
+        return self._call("format_to_markdown", params, session)
 
     
-    def generate_tailored_resume(self, job_description: str) -> str:
+    def generate_tailored_resume(self, job_description: str, base_resume: str | None = None,
+                                 session: str | None = None) -> str:
         """Generate a tailored resume based on job description."""
         
-        base_resume_path = os.path.join(os.path.dirname(__file__), "resume_base.md")
-        with open(base_resume_path, "r", encoding="utf-8") as f:
-            base_resume = f.read()
+        if base_resume is None:
+            with open(DEFAULT_BASE_RESUME_PATH, "r", encoding="utf-8") as f:
+                base_resume = f.read()
 
         params = {
             "base_resume": base_resume,
             "job_description": job_description
         }
 
-        return asyncio.run(self.call_tool("tailor_resume", params))
+        return self._call("tailor_resume", params, session)
 
     
     
@@ -108,7 +344,7 @@ class MCPClient:
             "filename": job_title               
         }
         
-        return asyncio.run(self.call_tool("save_tailored_resume", params))
+        return self._call("save_tailored_resume", params)
     
     def save_job_description(self, job_description: str, job_title: str) -> str:
         """Save the formatted job description."""
@@ -117,36 +353,87 @@ class MCPClient:
             "filename": job_title               
         }
         
-        return asyncio.run(self.call_tool("save_job", params))
+        return self._call("save_job", params)
     
     def close(self):
-        """Close the fastmcp client if needed."""
-        if hasattr(self.client, 'close'):
-            self.client.close()
+        """Stop the batchers and health checks and log call stats."""
+        for batcher in self._batchers.values():
+            batcher.close()
+            logger.info(f"Batch stats: {batcher.stats()}")
+        if self.token_budget is not None:
+            logger.info(f"Token budget stats: {self.token_budget.stats()}")
+        self.pool.close()
+        logger.info(f"MCP endpoint stats: {self.pool.stats()}")
 
 
 class TuneItAgent:
     """LangGraph agent for processing job descriptions and generating tailored resumes."""
-    
-    RESUME_PREFIX = "Gaston_M_Cuellar_"
 
-    def __init__(self, mcp_url: str):
+    def __init__(
+        self,
+        mcp_url: str,
+        profiles: tuple[ResumeProfile, ...] = DEFAULT_PROFILES,
+        mcp_options: dict | None = None,
+        output_sink=None,
+        profiler=None,
+        max_input_bytes: int = 2 * 1024 * 1024,
+        format_chunk_chars: int = 12000,
+        format_concurrency: int = 4,
+        history=None,
+    ):
         """
         Initialize the TuneIt agent.
         
         Args:
-            mcp_url: URL of the MCP server
+            mcp_url: URL of the MCP server, or comma-separated URLs of
+                several replicas to load balance across
+            profiles: Resume profiles each job description is tailored against
+            mcp_options: Extra keyword arguments for MCPClient (e.g. batching)
+            output_sink: Where outputs are saved (default: the MCP save tools)
+            profiler: JobProfiler that samples jobs for profiling (optional)
+            max_input_bytes: Job description files are read up to this size
+                (0 = no limit)
+            format_chunk_chars: Job descriptions longer than this are formatted
+                in section-aware chunks (0 = never chunk)
+            format_concurrency: Chunks formatted at the same time
+            history: JobHistory recording processed jobs for re-tailoring
+                (optional)
         """
-        self.mcp_client = MCPClient(mcp_url)
-        self.graph = self._build_graph()
-        logger.info("TuneIt agent initialized")
+        if not profiles:
+            raise ValueError("At least one resume profile is required")
+        self.mcp_client = MCPClient(mcp_url, **(mcp_options or {}))
+        self.output_sink = output_sink or MCPOutputSink(self.mcp_client)
+        self.profiles = tuple(profiles)
+        self.profiler = profiler
+        self.max_input_bytes = max_input_bytes
+        self.format_chunk_chars = format_chunk_chars
+        self.format_concurrency = format_concurrency
+        self.history = history
+        self._graph = None
+        logger.info(
+            f"TuneIt agent initialized with profiles: {[p.name for p in self.profiles]}"
+        )
+
+    @property
+    def graph(self):
+        """Compiled LangGraph workflow, built on first use."""
+        if self._graph is None:
+            self._graph = self._build_graph()
+        return self._graph
     
     def _read_job_description(self, state: AgentState) -> AgentState:
         """Read job description from file."""
         logger.info(f"Reading job description from: {state['job_description_path']}")
         try:
-            with open(state['job_description_path'], 'r', encoding='utf-8') as f:
-                content = f.read()
+            content, truncated = read_text_capped(
+                state['job_description_path'], self.max_input_bytes
+            )
+            if truncated:
+                state['warning'] = (
+                    f"Job description truncated to {self.max_input_bytes} bytes; "
+                    f"outputs cover only the first part"
+                )
+                logger.warning(f"{state['warning']}: {state['job_description_path']}")
             
             state['job_description_content'] = content
             state['status'] = 'job_description_read'
@@ -162,15 +449,18 @@ class TuneItAgent:
         """Format job description using MCP tool."""
         logger.info("Formatting job description")
         try:
-            result = self.mcp_client.format_job_description(
-                state['job_description_content']
-            )
+            content = state['job_description_content']
+            if self.format_chunk_chars and len(content) > self.format_chunk_chars:
+                result = self._format_in_chunks(content, state['job_id'])
+            else:
+                result = self.mcp_client.format_job_description(content, state['job_id'])
             
             # Extract formatted job description from result
             # formatted = result.get('formatted_job_description', result.get('result', ''))
             formatted = result
 
-            print("Formatted Job Description:", formatted)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Formatted job description: %s", truncate_payload(formatted))
             state['formatted_job_description'] = formatted
             state['status'] = 'job_description_formatted'
             logger.info("Job description formatted successfully")
@@ -181,49 +471,115 @@ class TuneItAgent:
             state['status'] = 'error'
             return state
     
-    def _generate_tailored_resume(self, state: AgentState) -> AgentState:
-        """Generate tailored resume using MCP tool."""
-        logger.info("Generating tailored resume")
+    def _format_in_chunks(self, content: str, job_id: str | None = None) -> str:
+        """Format a large job description chunk by chunk and merge in order."""
+        chunks = chunk_text(content, self.format_chunk_chars)
+        logger.info(f"Formatting job description in {len(chunks)} chunks")
+        with ThreadPoolExecutor(max_workers=min(self.format_concurrency, len(chunks))) as pool:
+            results = list(pool.map(
+                lambda chunk: self._format_chunk(chunk, job_id), chunks
+            ))
+        return "\n\n".join(result.strip() for result in results)
+    
+    def _format_chunk(self, chunk: str, job_id: str | None) -> str:
+        """Format one chunk on a pool thread, keeping the job's log context."""
+        with job_context(job_id):
+            return self.mcp_client.format_job_description(chunk, job_id)
+    
+    def tailor_resume(self, formatted_job_description: str, profile: ResumeProfile,
+                      base_resume: str | None = None,
+                      session: str | None = None) -> tuple[str, str]:
+        """
+        Tailor a profile's base resume to a formatted job description.
+        
+        Args:
+            formatted_job_description: Output of format_to_markdown
+            profile: Resume profile to tailor
+            base_resume: The profile's base resume (default: read from disk)
+            session: Session key (job ID) for sticky MCP endpoint routing
+            
+        Returns:
+            (tailored resume, hash of the base resume used)
+        """
+        if base_resume is None:
+            with open(profile.base_resume_path, "r", encoding="utf-8") as f:
+                base_resume = f.read()
+        
+        result = self.mcp_client.generate_tailored_resume(
+            formatted_job_description,
+            base_resume,
+            session
+        )
+        
+        # Extract tailored resume from result
+        # resume = result.get('tailored_resume', result.get('result', ''))
+        return result, content_hash(base_resume)
+    
+    def save_resume(self, job_title: str, profile: ResumeProfile, resume: str,
+                    base_resume_hash: str | None = None):
+        """Save a tailored resume and record its base resume in the history."""
+        self.output_sink.save_tailored_resume(resume, f"{profile.name}_{job_title}")
+        if self.history is not None and base_resume_hash is not None:
+            self.history.record_tailored(job_title, profile.name, base_resume_hash)
+    
+    def _generate_tailored_resume(self, state: ProfileState) -> dict:
+        """Generate a tailored resume for one profile using MCP tool."""
+        profile = state['profile']
+        logger.info(f"Generating tailored resume for profile: {profile.name}")
         try:
-            result = self.mcp_client.generate_tailored_resume(
-                state['formatted_job_description']
+            resume, base_resume_hash = self.tailor_resume(
+                state['formatted_job_description'], profile, session=state['job_id']
             )
-            
-            # Extract tailored resume from result
-            # resume = result.get('tailored_resume', result.get('result', ''))
-            resume = result
-            state['tailored_resume'] = resume
-            state['status'] = 'resume_generated'
-            logger.info("Tailored resume generated successfully")
-            return state
+            logger.info(f"Tailored resume generated successfully for profile: {profile.name}")
+            return {
+                "tailored_resumes": {profile.name: resume},
+                "base_resume_hashes": {profile.name: base_resume_hash},
+            }
         except Exception as e:
-            logger.error(f"Error generating tailored resume: {e}")
-            state['error'] = str(e)
-            state['status'] = 'error'
-            return state
+            logger.error(f"Error generating tailored resume for profile {profile.name}: {e}")
+            return {"profile_errors": {profile.name: str(e)}}
     
     def _save_outputs(self, state: AgentState) -> AgentState:
-        """Save tailored resume and job description using MCP tools."""
+        """Save tailored resumes and job description to the output sink."""
         logger.info("Saving outputs")
         try:
             # Extract job title from path or use default
             job_title = Path(state['job_description_path']).stem
-            resume_filename = f"{self.RESUME_PREFIX}{job_title}"
-            
 
             # Save job description
-            self.mcp_client.save_job_description(
+            self.output_sink.save_job_description(
                 state['formatted_job_description'],
                 job_title
             )
             logger.info("Job description saved")
+            if self.history is not None:
+                self.history.record_job(
+                    job_title,
+                    state['job_description_path'],
+                    state['formatted_job_description']
+                )
 
-            # Save tailored resume
-            self.mcp_client.save_tailored_resume(
-                state['tailored_resume'],
-                resume_filename
-            )
-            logger.info("Tailored resume saved")
+            # Save one tailored resume per profile that succeeded
+            for profile in self.profiles:
+                resume = state['tailored_resumes'].get(profile.name)
+                if resume is None:
+                    continue
+                self.save_resume(
+                    job_title,
+                    profile,
+                    resume,
+                    state['base_resume_hashes'].get(profile.name)
+                )
+                logger.info(f"Tailored resume saved for profile: {profile.name}")
+            
+            if state['profile_errors']:
+                failed = ", ".join(
+                    f"{name}: {error}" for name, error in state['profile_errors'].items()
+                )
+                state['error'] = f"Tailoring failed for profiles: {failed}"
+                state['status'] = 'error'
+                logger.error(state['error'])
+                return state
             
             state['status'] = 'completed'
             logger.info("All outputs saved successfully")
@@ -242,64 +598,156 @@ class TuneItAgent:
             return "end"
         return "continue"
     
-    def _build_graph(self) -> StateGraph:
+    def _fan_out_profiles(self, state: AgentState):
+        """Start one generate_resume branch per profile, sharing the formatted JD."""
+        from langgraph.graph import END
+        from langgraph.types import Send
+
+        if state.get('status') == 'error':
+            return END
+        return [
+            Send("generate_resume", {
+                "job_id": state['job_id'],
+                "profile": profile,
+                "formatted_job_description": state['formatted_job_description'],
+            })
+            for profile in self.profiles
+        ]
+    
+    def _timed(self, stage: str, node):
+        """Wrap a graph node so its duration is logged with the job ID."""
+        def run(state: AgentState) -> AgentState:
+            start = time.perf_counter()
+            profiled = self.profiler.get(state.get("job_id")) if self.profiler else None
+            result = profiled.run(node, state) if profiled else node(state)
+            logger.info(
+                f"Stage {stage} finished with status {result.get('status', 'ok')}",
+                extra={
+                    "job_id": state.get("job_id"),
+                    "stage": stage,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                }
+            )
+            return result
+        return run
+    
+    def _build_graph(self) -> "StateGraph":
         """Build the LangGraph workflow."""
+        from langgraph.graph import StateGraph, END
+
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("read_job_description", self._read_job_description)
-        workflow.add_node("format_job_description", self._format_job_description)
-        workflow.add_node("generate_resume", self._generate_tailored_resume)
-        workflow.add_node("save_outputs", self._save_outputs)
+        workflow.add_node("read_job_description",
+                          self._timed("read_job_description", self._read_job_description))
+        workflow.add_node("format_job_description",
+                          self._timed("format_job_description", self._format_job_description))
+        workflow.add_node("generate_resume",
+                          self._timed("generate_resume", self._generate_tailored_resume))
+        workflow.add_node("save_outputs",
+                          self._timed("save_outputs", self._save_outputs))
         
-        # Define the flow
+        # Define the flow; resume generation fans out to one parallel branch
+        # per profile and fans back in to a single save step
         workflow.set_entry_point("read_job_description")
-        workflow.add_edge("read_job_description", "format_job_description")
-        workflow.add_edge("format_job_description", "generate_resume")
+        workflow.add_conditional_edges(
+            "read_job_description",
+            self._should_continue,
+            {"continue": "format_job_description", "end": END}
+        )
+        workflow.add_conditional_edges(
+            "format_job_description",
+            self._fan_out_profiles,
+            ["generate_resume", END]
+        )
         workflow.add_edge("generate_resume", "save_outputs")
         workflow.add_edge("save_outputs", END)
         
         return workflow.compile()
     
-    def process_job_description(self, file_path: str) -> AgentState:
+    def _initial_state(self, file_path: str, job_id: str) -> AgentState:
+        """Return the state a job starts the workflow with."""
+        return {
+            "job_id": job_id,
+            "job_description_path": file_path,
+            "job_description_content": "",
+            "formatted_job_description": "",
+            "tailored_resumes": {},
+            "profile_errors": {},
+            "base_resume_hashes": {},
+            "status": "initialized",
+            "error": None,
+            "warning": None
+        }
+    
+    def process_job_description(self, file_path: str, job_id: str | None = None) -> AgentState:
         """
         Process a job description file through the complete workflow.
         
         Args:
             file_path: Path to the job description file
+            job_id: ID used in logs (default: a new random ID)
             
         Returns:
             Final agent state
         """
-        logger.info(f"Starting to process job description: {file_path}")
+        job_id = job_id or uuid.uuid4().hex[:12]
+        # Every record logged while this job runs carries its ID
+        job_token = current_job_id.set(job_id)
+        logger.info(
+            f"Starting to process job description: {file_path}",
+            extra={"job_id": job_id}
+        )
+        start = time.perf_counter()
         
-        initial_state: AgentState = {
-            "job_description_path": file_path,
-            "job_description_content": "",
-            "formatted_job_description": "",
-            "tailored_resume": "",
-            "status": "initialized",
-            "error": None
-        }
+        initial_state = self._initial_state(file_path, job_id)
         
+        profiled = None
         try:
-            final_state = self.graph.invoke(initial_state)
+            graph = self.graph
+            if self.profiler:
+                profiled = self.profiler.start_job(job_id, Path(file_path).stem)
+            if profiled:
+                final_state = profiled.run(graph.invoke, initial_state)
+            else:
+                final_state = graph.invoke(initial_state)
+            timing = {
+                "job_id": job_id,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            }
             
             if final_state['status'] == 'completed':
-                logger.info(f"Successfully processed: {file_path}")
+                if final_state.get('warning'):
+                    logger.warning(f"Processed with warning: {file_path}: "
+                                   f"{final_state['warning']}", extra=timing)
+                else:
+                    logger.info(f"Successfully processed: {file_path}", extra=timing)
             else:
-                logger.error(f"Processing failed for {file_path}: {final_state.get('error')}")
+                logger.error(
+                    f"Processing failed for {file_path}: {final_state.get('error')}",
+                    extra=timing
+                )
             
             return final_state
         except Exception as e:
-            logger.error(f"Unexpected error processing {file_path}: {e}")
+            logger.error(
+                f"Unexpected error processing {file_path}: {e}",
+                extra={"job_id": job_id}
+            )
             initial_state['error'] = str(e)
             initial_state['status'] = 'error'
             return initial_state
+        finally:
+            if profiled:
+                self.profiler.finish_job(job_id)
+            current_job_id.reset(job_token)
     
     def close(self):
         """Clean up resources."""
+        self.output_sink.close()
         self.mcp_client.close()
+        if self.history is not None:
+            self.history.close()
         logger.info("TuneIt agent closed")
 
 
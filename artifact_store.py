@@ -0,0 +1,401 @@
+"""
+Artifact Store - Compressed, deduplicated archive of generated outputs.
+
+Months of runs produce hundreds of thousands of mostly similar Markdown files.
+The store keeps each distinct output once, compressed and addressed by the
+SHA-256 of its content, and a small SQLite index maps (kind, name, timestamp)
+to the content:
+
+    <archive>/index.db                  artifacts, blobs and dictionaries
+    <archive>/objects/<ab>/<sha256>     one compressed blob per distinct content
+    <archive>/dictionaries/<id>.zdict   zstd dictionaries trained on past outputs
+
+Blobs are compressed with zstd (or gzip). Small, similar documents compress
+much better with a dictionary trained on earlier ones: once trained
+(`python run.py train-dictionary`), new blobs of that kind use the newest
+dictionary, and older blobs keep the one they were written with.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ("zstd", "gzip")
+DEFAULT_LEVELS = {"zstd": 9, "gzip": 6}
+DEFAULT_DICTIONARY_SIZE = 112 * 1024
+EXPORT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    compression TEXT NOT NULL,
+    dict_id INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs (digest)
+);
+CREATE INDEX IF NOT EXISTS artifacts_by_name ON artifacts (kind, name, created_at);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    dict_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    samples INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression needs the zstandard package (pip install zstandard); "
+            "or set ARCHIVE_COMPRESSION=gzip"
+        ) from e
+    return zstandard
+
+
+class ArtifactStore:
+    """Content-addressed, compressed store of outputs with a SQLite index."""
+
+    def __init__(
+        self,
+        directory: str,
+        compression: str = "zstd",
+        level: int | None = None,
+        fsync: bool = True,
+    ):
+        """
+        Open (or create) the store.
+
+        Args:
+            directory: Root directory of the archive
+            compression: "zstd" or "gzip"
+            level: Compression level (default: DEFAULT_LEVELS[compression])
+            fsync: Make each new blob durable before it is indexed
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}, expected one of {COMPRESSIONS}")
+        if compression == "zstd":
+            self._zstd = _require_zstandard()
+
+        self.directory = Path(directory)
+        self.compression = compression
+        self.level = level if level is not None else DEFAULT_LEVELS[compression]
+        self.fsync = fsync
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        (self.directory / "dictionaries").mkdir(exist_ok=True)
+
+        self._conn = sqlite3.connect(self.directory / "index.db", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # zstd (de)compressors are not thread-safe, so each thread keeps its own
+        self._local = threading.local()
+        self._dictionaries = {}
+        logger.info(f"Artifact store at {self.directory} ({compression}, level {self.level})")
+
+    # Compression
+
+    def _dictionary(self, dict_id: int):
+        """Load a trained zstd dictionary by ID."""
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            data = (self.directory / "dictionaries" / f"{dict_id}.zdict").read_bytes()
+            dictionary = self._dictionaries[dict_id] = self._zstd.ZstdCompressionDict(data)
+        return dictionary
+
+    def _compressor(self, dict_id: int):
+        compressors = getattr(self._local, "compressors", None)
+        if compressors is None:
+            compressors = self._local.compressors = {}
+        compressor = compressors.get(dict_id)
+        if compressor is None:
+            compressor = compressors[dict_id] = self._zstd.ZstdCompressor(
+                level=self.level,
+                dict_data=self._dictionary(dict_id) if dict_id else None
+            )
+        return compressor
+
+    def _decompressor(self, dict_id: int):
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            if not hasattr(self, "_zstd"):
+                self._zstd = _require_zstandard()
+            decompressor = decompressors[dict_id] = self._zstd.ZstdDecompressor(
+                dict_data=self._dictionary(dict_id) if dict_id else None
+            )
+        return decompressor
+
+    def _active_dictionary(self, kind: str) -> int:
+        """
+        Return the ID of the newest dictionary of a kind (0 = none).
+
+        Read from the index on each new blob, so a dictionary trained by
+        another process (`run.py train-dictionary`) is picked up without a
+        restart.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dict_id FROM dictionaries WHERE kind = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (kind,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _compress(self, kind: str, data: bytes) -> tuple[bytes, int]:
+        """Compress data, returning the blob and the dictionary ID used (0 = none)."""
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=self.level, mtime=0), 0
+        dict_id = self._active_dictionary(kind)
+        return self._compressor(dict_id).compress(data), dict_id
+
+    def _open_blob(self, digest: str, compression: str, dict_id: int):
+        """Open a blob as a stream of its decompressed content."""
+        if compression == "gzip":
+            return gzip.open(self._blob_path(digest), "rb")
+        f = open(self._blob_path(digest), "rb")
+        return self._decompressor(dict_id).stream_reader(f, closefd=True)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / digest
+
+    # Writing
+
+    def put(self, kind: str, name: str, content: str) -> str:
+        """
+        Store a version of an output.
+
+        Content already in the store is not written again; only a new index
+        entry pointing at it is added.
+
+        Args:
+            kind: Output kind, e.g. "resumes"
+            name: Output name (the file name it would otherwise be saved as)
+            content: Output text
+
+        Returns:
+            SHA-256 digest of the content
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+
+        if not known:
+            blob, dict_id = self._compress(kind, data)
+            self._write_blob(digest, blob)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?)",
+                    (digest, self.compression, dict_id, len(data), len(blob))
+                )
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO artifacts (kind, name, created_at, digest) VALUES (?, ?, ?, ?)",
+                (kind, name, time.time(), digest)
+            )
+        logger.debug(f"Stored {kind}/{name} as {digest[:12]}{' (deduplicated)' if known else ''}")
+        return digest
+
+    def _write_blob(self, digest: str, blob: bytes):
+        """Write a blob atomically; it is indexed only after this returns."""
+        path = self._blob_path(digest)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{digest[:12]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    # Reading
+
+    def get(self, kind: str, name: str, at: float | None = None) -> str | None:
+        """
+        Return an output's content.
+
+        Args:
+            kind: Output kind
+            name: Output name
+            at: Return the version current at this Unix timestamp
+                (default: the latest version)
+
+        Returns:
+            The content, or None if there is no such version
+        """
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT b.digest, b.compression, b.dict_id FROM artifacts a
+                JOIN blobs b ON b.digest = a.digest
+                WHERE a.kind = ? AND a.name = ? AND a.created_at <= ?
+                ORDER BY a.created_at DESC, a.id DESC LIMIT 1
+                """,
+                (kind, name, at if at is not None else float("inf"))
+            ).fetchone()
+        if row is None:
+            return None
+        with self._open_blob(*row) as stream:
+            return stream.read().decode("utf-8")
+
+    def versions(self, kind: str, name: str) -> list[tuple[float, str]]:
+        """Return (timestamp, digest) of every version of an output, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT created_at, digest FROM artifacts WHERE kind = ? AND name = ? "
+                "ORDER BY created_at, id",
+                (kind, name)
+            ).fetchall()
+
+    def export(self, destination: str, all_versions: bool = False) -> int:
+        """
+        Write outputs out as plain files, one blob at a time.
+
+        Files are written to <destination>/<kind>/<name>.md; with
+        all_versions, every version is written as <name>@<UTC timestamp>.md.
+
+        Args:
+            destination: Directory to export to
+            all_versions: Export every version instead of the latest
+
+        Returns:
+            Number of files written
+        """
+        query = """
+            SELECT a.kind, a.name, a.created_at, b.digest, b.compression, b.dict_id
+            FROM artifacts a JOIN blobs b ON b.digest = a.digest
+        """
+        if not all_versions:
+            query += """
+                WHERE a.id = (SELECT a2.id FROM artifacts a2
+                              WHERE a2.kind = a.kind AND a2.name = a.name
+                              ORDER BY a2.created_at DESC, a2.id DESC LIMIT 1)
+            """
+        destination = Path(destination)
+        written = 0
+        # A separate read connection, so saves aren't blocked while exporting
+        conn = sqlite3.connect(self.directory / "index.db")
+        try:
+            cursor = conn.execute(query)
+            while rows := cursor.fetchmany(EXPORT_BATCH_SIZE):
+                for kind, name, created_at, digest, compression, dict_id in rows:
+                    if all_versions:
+                        stamp = datetime.fromtimestamp(created_at, timezone.utc)
+                        name = f"{name}@{stamp.strftime('%Y%m%dT%H%M%S.%fZ')}"
+                    path = destination / kind / f"{name}.md"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with self._open_blob(digest, compression, dict_id) as src, open(path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    written += 1
+        finally:
+            conn.close()
+        logger.info(f"Exported {written} file(s) to {destination}")
+        return written
+
+    # Dictionaries
+
+    def train_dictionary(
+        self,
+        kind: str,
+        max_samples: int = 5000,
+        dict_size: int = DEFAULT_DICTIONARY_SIZE,
+    ) -> int | None:
+        """
+        Train a zstd dictionary on the most recent outputs of a kind.
+
+        New blobs of that kind are compressed with it from now on.
+
+        Args:
+            kind: Output kind to train on
+            max_samples: Number of recent distinct outputs used as samples
+            dict_size: Maximum dictionary size in bytes
+
+        Returns:
+            The new dictionary's ID, or None if there were too few samples
+        """
+        if self.compression != "zstd":
+            raise ValueError("Dictionary compression requires ARCHIVE_COMPRESSION=zstd")
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT b.digest, b.compression, b.dict_id FROM blobs b
+                WHERE b.digest IN (SELECT digest FROM artifacts WHERE kind = ?
+                                   ORDER BY created_at DESC LIMIT ?)
+                """,
+                (kind, max_samples)
+            ).fetchall()
+        if len(rows) < 10:
+            logger.warning(f"Not enough {kind} to train a dictionary ({len(rows)} found)")
+            return None
+
+        samples = []
+        for row in rows:
+            with self._open_blob(*row) as stream:
+                samples.append(stream.read())
+        dictionary = self._zstd.train_dictionary(dict_size, samples, level=self.level)
+        dict_id = dictionary.dict_id()
+
+        path = self.directory / "dictionaries" / f"{dict_id}.zdict"
+        path.write_bytes(dictionary.as_bytes())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dictionaries VALUES (?, ?, ?, ?)",
+                (dict_id, kind, len(samples), time.time())
+            )
+        self._dictionaries[dict_id] = dictionary
+        logger.info(f"Trained {len(dictionary.as_bytes())}-byte dictionary {dict_id} "
+                    f"on {len(samples)} {kind}")
+        return dict_id
+
+    def stats(self) -> dict:
+        """Return artifact and blob counts and the overall compression ratio."""
+        with self._lock:
+            artifacts, = self._conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()
+            blobs, size, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "artifacts": artifacts,
+            "blobs": blobs,
+            "bytes": size,
+            "stored_bytes": stored,
+            "compression_ratio": round(size / stored, 2) if stored else 0.0,
+        }
+
+    def close(self):
+        """Close the index."""
+        with self._lock:
+            self._conn.close()
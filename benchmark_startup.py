@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - Measures cold-start and first-job latency of the agent.
+
+Each measurement runs in a fresh Python interpreter so module caches don't
+hide import costs. First-job latency needs a reachable MCP server.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 10 --job examples/ai_ml_engineer.txt
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Snippets run in a fresh interpreter; each prints its own timing in seconds
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+FIRST_JOB_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from agent import TuneItAgent
+agent = TuneItAgent({mcp_url!r})
+ready = time.perf_counter()
+result = agent.process_job_description({job!r})
+done = time.perf_counter()
+agent.close()
+print(ready - start, done - ready, result['status'])
+"""
+
+
+def run_snippet(snippet: str) -> str:
+    """Run a snippet in a fresh interpreter and return its last output line."""
+    proc = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return proc.stdout.strip().splitlines()[-1]
+
+
+def time_command(args: list[str]) -> float:
+    """Return the wall time of a command in a fresh interpreter."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True)
+    return time.perf_counter() - start
+
+
+def report(name: str, samples: list[float]):
+    """Print min/median/max of a list of timings in milliseconds."""
+    print(
+        f"{name:<28} min {min(samples) * 1000:8.1f} ms   "
+        f"median {statistics.median(samples) * 1000:8.1f} ms   "
+        f"max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description="TuneIt AI Agent startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument(
+        "--job",
+        default=str(ROOT / "examples" / "senior_python_developer.txt"),
+        help="Job description used for the first-job measurement"
+    )
+    parser.add_argument(
+        "--mcp-url",
+        default=os.getenv("MCP_SERVER_URL", "http://localhost:8000"),
+        help="MCP server used for the first-job measurement"
+    )
+    parser.add_argument(
+        "--skip-first-job",
+        action="store_true",
+        help="Only measure imports and the health check"
+    )
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {args.runs} runs per measurement")
+    print("-" * 80)
+
+    for module in ("run", "agent", "file_watcher"):
+        samples = [
+            float(run_snippet(IMPORT_SNIPPET.format(module=module)))
+            for _ in range(args.runs)
+        ]
+        report(f"import {module}", samples)
+
+    samples = [time_command(["run.py", "--healthcheck"]) for _ in range(args.runs)]
+    report("run.py --healthcheck (wall)", samples)
+
+    if args.skip_first_job:
+        return 0
+
+    snippet = FIRST_JOB_SNIPPET.format(mcp_url=args.mcp_url, job=str(Path(args.job).resolve()))
+    init_samples, job_samples = [], []
+    for _ in range(args.runs):
+        try:
+            init_time, job_time, status = run_snippet(snippet).split()
+        except subprocess.CalledProcessError as e:
+            print(f"First-job run failed: {e.stderr.strip().splitlines()[-1]}")
+            return 1
+        if status != "completed":
+            print(f"First job did not complete (status: {status}); is the MCP server up?")
+            return 1
+        init_samples.append(float(init_time))
+        job_samples.append(float(job_time))
+
+    report("agent import + init", init_samples)
+    report("first job", job_samples)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Chunking - Bounded reading and section-aware splitting of large job descriptions.
+
+Very large inputs (multi-posting exports, pasted career pages) time out or
+exceed model limits when formatted in one request. read_text_capped reads at
+most a fixed number of bytes however large the file is, and chunk_text
+splits the text at section boundaries into pieces small enough to format
+independently and concatenate in order.
+"""
+
+import codecs
+import re
+
+READ_BLOCK_SIZE = 64 * 1024
+
+# Lines that start a new section: Markdown headings, short ALL-CAPS lines,
+# and short lines ending in a colon ("Responsibilities:")
+_HEADING = re.compile(
+    r"^\s*(#{1,6}\s+\S|[A-Z][A-Z0-9 &/,'()\-]{2,60}:?\s*$|[^\n.!?]{1,80}:\s*$)"
+)
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def read_text_capped(file_path: str, max_bytes: int) -> tuple[str, bool]:
+    """
+    Read a UTF-8 text file, stopping after max_bytes.
+
+    The file is read in fixed-size blocks, so memory use is bounded by
+    max_bytes regardless of the file's size. Newlines are normalized to
+    "\\n" as with text-mode open().
+
+    Args:
+        file_path: Path to the file
+        max_bytes: Maximum number of bytes to read (0 = no limit)
+
+    Returns:
+        (text, truncated) where truncated is True if the file was longer
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    remaining = max_bytes if max_bytes > 0 else None
+    truncated = False
+    with open(file_path, "rb") as f:
+        while remaining is None or remaining > 0:
+            size = READ_BLOCK_SIZE if remaining is None else min(READ_BLOCK_SIZE, remaining)
+            block = f.read(size)
+            if not block:
+                break
+            parts.append(decoder.decode(block))
+            if remaining is not None:
+                remaining -= len(block)
+        if remaining == 0 and f.read(1):
+            truncated = True
+    # A multi-byte character cut off by the cap is dropped rather than
+    # raising; a genuinely invalid file still raises
+    if not truncated:
+        parts.append(decoder.decode(b"", final=True))
+    # Universal newlines, as text-mode open() would give
+    text = "".join(parts).replace("\r\n", "\n").replace("\r", "\n")
+    return text, truncated
+
+
+def split_sections(text: str) -> list[str]:
+    """Split text into sections, each starting at a heading-like line."""
+    sections = []
+    current = []
+    for line in text.splitlines(keepends=True):
+        if current and _HEADING.match(line) and any(l.strip() for l in current):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def _split_oversized(section: str, max_chars: int) -> list[str]:
+    """Split a section longer than max_chars at paragraphs, then lines, then hard."""
+    paragraphs = _PARAGRAPH_BREAK.split(section)
+    if len(paragraphs) > 1 and all(len(p) <= max_chars for p in paragraphs):
+        return _pack(paragraphs, max_chars, separator="\n\n")
+    lines = section.splitlines(keepends=True)
+    if len(lines) > 1 and all(len(line) <= max_chars for line in lines):
+        return _pack(lines, max_chars)
+    return [section[i:i + max_chars] for i in range(0, len(section), max_chars)]
+
+
+def _pack(pieces: list[str], max_chars: int, separator: str = "") -> list[str]:
+    """Greedily pack pieces into chunks of at most max_chars."""
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if current and len(candidate) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_text(text: str, max_chars: int) -> list[str]:
+    """
+    Split text into chunks of at most max_chars, preferring section boundaries.
+
+    Whole sections are packed together where they fit; a section that is
+    too long on its own is split at paragraphs, then lines. Chunks are
+    returned in document order.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Non-empty list of chunks
+    """
+    if max_chars <= 0:
+        raise ValueError("max_chars must be positive")
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces = []
+    for section in split_sections(text):
+        if len(section) <= max_chars:
+            pieces.append(section)
+        else:
+            pieces.extend(_split_oversized(section, max_chars))
+    return [chunk for chunk in _pack(pieces, max_chars) if chunk.strip()] or [text[:max_chars]]
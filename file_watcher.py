@@ -12,23 +12,32 @@ from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent
 
+from processed_tracker import ProcessedFileTracker, file_digest
+
 logger = logging.getLogger(__name__)
 
 
 class JobDescriptionHandler(FileSystemEventHandler):
     """Handler for new job description files."""
     
-    def __init__(self, agent, allowed_extensions=None):
+    def __init__(self, agent, allowed_extensions=None, processed_files=None, job_queue=None):
         """
         Initialize the file handler.
         
         Args:
             agent: TuneItAgent instance to process files
             allowed_extensions: List of allowed file extensions (default: ['.txt', '.md'])
+            processed_files: ProcessedFileTracker for duplicate detection
+                (default: a tracker with default bounds)
+            job_queue: JobQueue to submit files to (default: process them
+                inline in the watcher thread)
         """
         self.agent = agent
+        self.job_queue = job_queue
         self.allowed_extensions = allowed_extensions or ['.txt', '.md', '.pdf']
-        self.processed_files = set()
+        self.processed_files = (
+            processed_files if processed_files is not None else ProcessedFileTracker()
+        )
         logger.info(f"File handler initialized with extensions: {self.allowed_extensions}")
     
     def on_created(self, event):
@@ -44,39 +53,55 @@ class JobDescriptionHandler(FileSystemEventHandler):
             logger.debug(f"Ignoring file with extension {file_ext}: {file_path}")
             return
         
-        # Avoid processing the same file multiple times
-        if file_path in self.processed_files:
+        # Wait a moment to ensure file is fully written
+        time.sleep(1)
+        
+        try:
+            file_key = file_digest(file_path)
+        except OSError as e:
+            logger.error(f"Error fingerprinting {file_path}: {e}")
+            return
+        
+        # Mark as processed before attempting to avoid duplicate processing
+        if not self.processed_files.add(file_key):
             logger.debug(f"File already processed: {file_path}")
             return
         
         logger.info(f"New job description detected: {file_path}")
         
-        # Wait a moment to ensure file is fully written
-        time.sleep(1)
-        
-        # Mark as processed before attempting to avoid duplicate processing
-        self.processed_files.add(file_path)
+        if self.job_queue is not None:
+            # Blocks while the queue is full so no file events are dropped
+            self.job_queue.submit(
+                file_path,
+                source="file",
+                on_done=lambda record: self._job_done(
+                    file_path, file_key, record.status, record.error
+                )
+            )
+            return
         
         try:
             # Process the job description
             result = self.agent.process_job_description(file_path)
-            
-            if result['status'] == 'completed':
-                logger.info(f"Successfully processed: {file_path}")
-            else:
-                logger.error(f"Failed to process {file_path}: {result.get('error')}")
-                # Remove from processed set so it can be retried
-                self.processed_files.discard(file_path)
+            self._job_done(file_path, file_key, result['status'], result.get('error'))
         except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
+            self._job_done(file_path, file_key, 'error', str(e))
+    
+    def _job_done(self, file_path, file_key, status, error):
+        """Log the outcome of a job and allow failed files to be retried."""
+        if status == 'completed':
+            logger.info(f"Successfully processed: {file_path}")
+        else:
+            logger.error(f"Failed to process {file_path}: {error}")
             # Remove from processed set so it can be retried
-            self.processed_files.discard(file_path)
+            self.processed_files.discard(file_key)
 
 
 class FileWatcher:
     """Watches a directory for new job description files."""
     
-    def __init__(self, agent, watch_directory: str, allowed_extensions=None):
+    def __init__(self, agent, watch_directory: str, allowed_extensions=None,
+                 processed_files=None, job_queue=None):
         """
         Initialize the file watcher.
         
@@ -84,10 +109,14 @@ class FileWatcher:
             agent: TuneItAgent instance to process files
             watch_directory: Directory to watch for new files
             allowed_extensions: List of allowed file extensions
+            processed_files: ProcessedFileTracker for duplicate detection
+            job_queue: JobQueue shared with other ingestion sources
         """
         self.agent = agent
         self.watch_directory = watch_directory
-        self.event_handler = JobDescriptionHandler(agent, allowed_extensions)
+        self.event_handler = JobDescriptionHandler(
+            agent, allowed_extensions, processed_files, job_queue
+        )
         self.observer = Observer()
         
         # Create watch directory if it doesn't exist
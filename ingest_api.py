@@ -0,0 +1,244 @@
+"""
+Ingest API - HTTP endpoint for submitting job descriptions.
+
+Lets upstream scrapers submit job descriptions over HTTP instead of writing
+to the watched directory. Submissions are spooled to disk and fed into the
+same JobQueue as the file watcher.
+
+Endpoints:
+    POST /jobs                 Submit a job description (text or JSON)
+    GET  /jobs/{job_id}        Job status; ?wait=N long-polls up to N seconds
+    GET  /jobs/{job_id}/events Server-sent events stream ending on completion
+    GET  /health               Queue depth, stage utilization and liveness
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import uuid
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+logger = logging.getLogger(__name__)
+
+MAX_WAIT_SECONDS = 60
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _safe_name(name: str) -> str:
+    """Turn a client-supplied job name into a safe file stem."""
+    return _UNSAFE_NAME_CHARS.sub("_", name).strip("._")[:100]
+
+
+def _write_spool_file(path: Path, content: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _done_future(record) -> asyncio.Future:
+    """Return a future on the running loop that resolves when a job record finishes."""
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def on_done(_record):
+        loop.call_soon_threadsafe(lambda: done.done() or done.set_result(True))
+
+    record.add_done_callback(on_done)
+    return done
+
+
+async def _wait_done(done: asyncio.Future, timeout: float) -> bool:
+    """Wait until a _done_future resolves or the timeout passes."""
+    try:
+        # Shielded, so a timeout leaves the future usable for the next wait
+        await asyncio.wait_for(asyncio.shield(done), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def _remove_spool_file(file_path: str):
+    """Delete a finished job's spool file."""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove spool file {file_path}: {e}")
+
+
+def create_app(job_queue, spool_directory: str, max_bytes: int = 1024 * 1024) -> Starlette:
+    """
+    Create the ingestion API application.
+
+    Args:
+        job_queue: JobQueue that receives submitted jobs
+        spool_directory: Directory where submitted job descriptions are written
+        max_bytes: Largest accepted request body
+
+    Returns:
+        The Starlette application
+    """
+    spool_path = Path(spool_directory)
+    spool_path.mkdir(parents=True, exist_ok=True)
+
+    async def submit_job(request: Request):
+        if job_queue.full():
+            return JSONResponse(
+                {"error": "Job queue is full"},
+                status_code=429,
+                headers={"Retry-After": str(job_queue.retry_after())}
+            )
+
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > max_bytes:
+            return JSONResponse({"error": "Request body too large"}, status_code=413)
+        body = await request.body()
+        if len(body) > max_bytes:
+            return JSONResponse({"error": "Request body too large"}, status_code=413)
+
+        name = request.query_params.get("name", "")
+        if request.headers.get("content-type", "").startswith("application/json"):
+            try:
+                payload = json.loads(body)
+                content = payload["content"]
+                name = payload.get("name", name)
+            except (ValueError, KeyError, TypeError):
+                return JSONResponse(
+                    {"error": "Expected JSON object with a 'content' field"},
+                    status_code=400
+                )
+        else:
+            content = body.decode("utf-8", errors="replace")
+
+        if not isinstance(content, str) or not isinstance(name, str):
+            return JSONResponse(
+                {"error": "'content' and 'name' must be strings"},
+                status_code=400
+            )
+        if not content.strip():
+            return JSONResponse({"error": "Empty job description"}, status_code=400)
+
+        # The file stem becomes the job title of the saved outputs
+        stem = _safe_name(name) or "job"
+        file_path = spool_path / f"{stem}_{uuid.uuid4().hex[:8]}.txt"
+        await asyncio.to_thread(_write_spool_file, file_path, content)
+
+        try:
+            # The agent has read the spool file by the time the job finishes
+            record = job_queue.submit(
+                str(file_path),
+                source="http",
+                block=False,
+                on_done=lambda record: _remove_spool_file(record.file_path)
+            )
+        except queue.Full:
+            os.remove(file_path)
+            return JSONResponse(
+                {"error": "Job queue is full"},
+                status_code=429,
+                headers={"Retry-After": str(job_queue.retry_after())}
+            )
+
+        return JSONResponse(
+            {
+                "job_id": record.job_id,
+                "status": record.status,
+                "status_url": f"/jobs/{record.job_id}",
+                "events_url": f"/jobs/{record.job_id}/events",
+            },
+            status_code=202
+        )
+
+    async def job_status(request: Request):
+        record = job_queue.get(request.path_params["job_id"])
+        if record is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+
+        try:
+            wait = min(float(request.query_params.get("wait", "0")), MAX_WAIT_SECONDS)
+        except ValueError:
+            return JSONResponse({"error": "wait must be a number"}, status_code=400)
+        if wait > 0 and not record.done:
+            await _wait_done(_done_future(record), wait)
+        return JSONResponse(record.to_dict())
+
+    async def job_events(request: Request):
+        record = job_queue.get(request.path_params["job_id"])
+        if record is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+
+        async def stream():
+            yield f"event: status\ndata: {json.dumps(record.to_dict())}\n\n"
+            # One callback per stream, however many keep-alives it sends
+            done = _done_future(record)
+            while not await _wait_done(done, 15):
+                # Keep idle connections alive through proxies
+                yield ": keep-alive\n\n"
+            yield f"event: done\ndata: {json.dumps(record.to_dict())}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def health(request: Request):
+        body = {"status": "ok", "queue_size": job_queue.qsize()}
+        if hasattr(job_queue, "stage_stats"):
+            body["stages"] = job_queue.stage_stats()
+        body["mcp_endpoints"] = job_queue.agent.mcp_client.endpoint_stats()
+        return JSONResponse(body)
+
+    return Starlette(routes=[
+        Route("/jobs", submit_job, methods=["POST"]),
+        Route("/jobs/{job_id}", job_status, methods=["GET"]),
+        Route("/jobs/{job_id}/events", job_events, methods=["GET"]),
+        Route("/health", health, methods=["GET"]),
+    ])
+
+
+class IngestServer:
+    """Runs the ingestion API with uvicorn in a background thread."""
+
+    def __init__(self, job_queue, spool_directory: str, host: str = "127.0.0.1",
+                 port: int = 8080, max_bytes: int = 1024 * 1024):
+        """
+        Initialize the server.
+
+        Args:
+            job_queue: JobQueue that receives submitted jobs
+            spool_directory: Directory where submitted job descriptions are written
+            host: Interface to listen on
+            port: Port to listen on
+            max_bytes: Largest accepted request body
+        """
+        import uvicorn
+
+        self.host = host
+        self.port = port
+        self.server = uvicorn.Server(uvicorn.Config(
+            create_app(job_queue, spool_directory, max_bytes),
+            host=host,
+            port=port,
+            log_config=None,
+            access_log=False
+        ))
+        self.thread = None
+
+    def start(self):
+        """Start serving in a background thread."""
+        self.thread = threading.Thread(target=self.server.run, name="ingest-api", daemon=True)
+        self.thread.start()
+        logger.info(f"Ingest API listening on http://{self.host}:{self.port}")
+
+    def stop(self):
+        """Stop the server and wait for it to exit."""
+        self.server.should_exit = True
+        if self.thread is not None:
+            self.thread.join()
+        logger.info("Ingest API stopped")
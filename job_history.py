@@ -0,0 +1,110 @@
+"""
+Job History - Persistent record of processed jobs for incremental re-tailoring.
+
+Each processed job stores its formatted job description, and each tailored
+resume stores the hash of the base resume it was generated from. When a base
+resume changes, `run.py retailor` uses this to re-run only tailoring and
+saving for the resumes that are out of date, without re-formatting anything.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_title TEXT PRIMARY KEY,
+    source_path TEXT NOT NULL,
+    formatted_job_description TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tailored_resumes (
+    job_title TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    base_resume_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_title, profile)
+);
+"""
+
+
+def content_hash(content: str) -> str:
+    """Return the hash used to tell base resume versions apart."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class JobHistory:
+    """SQLite-backed history of formatted job descriptions and tailored resumes."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the history database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        logger.info(f"Job history database: {db_path}")
+
+    def record_job(self, job_title: str, source_path: str, formatted_job_description: str):
+        """Store (or replace) a job's formatted job description."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?)",
+                (job_title, source_path, formatted_job_description, time.time())
+            )
+
+    def record_tailored(self, job_title: str, profile: str, base_resume_hash: str):
+        """Record that a job's resume for a profile was generated from a base resume."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tailored_resumes VALUES (?, ?, ?, ?)",
+                (job_title, profile, base_resume_hash, time.time())
+            )
+
+    def get_formatted(self, job_title: str) -> str | None:
+        """Return a job's stored formatted job description."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT formatted_job_description FROM jobs WHERE job_title = ?",
+                (job_title,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def stale_jobs(self, profile: str, base_resume_hash: str) -> list[str]:
+        """
+        List jobs whose resume for a profile is missing or from another base resume.
+
+        Args:
+            profile: Profile name
+            base_resume_hash: Hash of the profile's current base resume
+
+        Returns:
+            Job titles, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT j.job_title FROM jobs j
+                LEFT JOIN tailored_resumes t
+                    ON t.job_title = j.job_title AND t.profile = ?
+                WHERE t.base_resume_hash IS NULL OR t.base_resume_hash != ?
+                ORDER BY j.updated_at
+                """,
+                (profile, base_resume_hash)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+"""
+Job Queue - Bounded queue of job descriptions shared by all ingestion sources.
+
+The file watcher and the HTTP ingestion API both submit job description
+files here; a pool of worker threads runs each one through the agent. Job
+records are kept in a bounded history so their status can be looked up
+after they finish.
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class JobRecord:
+    """Status of one submitted job."""
+
+    def __init__(self, job_id: str, file_path: str, source: str):
+        self.job_id = job_id
+        self.file_path = file_path
+        self.source = source
+        self.status = "queued"
+        self.error = None
+        # Set when the job completed on partial input
+        self.warning = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._callbacks: list[Callable[["JobRecord"], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "error")
+
+    def add_done_callback(self, callback: Callable[["JobRecord"], None]):
+        """Call callback(record) when the job finishes (immediately if it has)."""
+        with self._lock:
+            if not self.done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, status: str, error: str | None, warning: str | None = None):
+        """Record the outcome and run the done callbacks."""
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.warning = warning
+            self.finished_at = time.time()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Error in job {self.job_id} done callback: {e}")
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable view of the record."""
+        return {
+            "job_id": self.job_id,
+            "file_path": self.file_path,
+            "source": self.source,
+            "status": self.status,
+            "error": self.error,
+            "warning": self.warning,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Bounded job queue processed by a pool of worker threads."""
+
+    def __init__(self, agent, max_size: int = 100, workers: int = 1, history_size: int = 10000):
+        """
+        Initialize the job queue.
+
+        Args:
+            agent: TuneItAgent instance to process jobs
+            max_size: Maximum number of jobs waiting to be processed
+            workers: Number of jobs processed concurrently
+            history_size: Number of job records kept for status lookups
+        """
+        self.agent = agent
+        self.workers = workers
+        self.history_size = history_size
+        self._queue: queue.Queue[JobRecord | None] = queue.Queue(maxsize=max_size)
+        self._records: OrderedDict[str, JobRecord] = OrderedDict()
+        self._records_lock = threading.Lock()
+        self._threads = []
+        # Moving average of job duration, used to suggest retry delays
+        self._avg_duration = 1.0
+
+    def start(self):
+        """Start the worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Job queue started with {self.workers} worker(s)")
+
+    def stop(self):
+        """Let workers finish their current job and stop them; queued jobs are cancelled."""
+        self._cancel_pending()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+        logger.info("Job queue stopped")
+
+    def _cancel_pending(self):
+        """Finish jobs that haven't started as errors, so stopping doesn't wait for the backlog."""
+        cancelled = 0
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:
+                record._finish("error", "Service stopped before the job started")
+                cancelled += 1
+        if cancelled:
+            logger.warning(f"Cancelled {cancelled} queued job(s) on shutdown")
+
+    def submit(
+        self,
+        file_path: str,
+        source: str = "file",
+        block: bool = True,
+        on_done: Callable[[JobRecord], None] | None = None,
+    ) -> JobRecord:
+        """
+        Queue a job description file for processing.
+
+        Args:
+            file_path: Path to the job description file
+            source: Where the job came from (for status and logs)
+            block: Wait for space when the queue is full instead of failing
+            on_done: Called with the JobRecord when the job finishes
+
+        Returns:
+            The new job's record
+
+        Raises:
+            queue.Full: If block is False and the queue is full
+        """
+        record = JobRecord(uuid.uuid4().hex[:12], file_path, source)
+        if on_done is not None:
+            record.add_done_callback(on_done)
+        self._queue.put(record, block=block)
+        with self._records_lock:
+            self._records[record.job_id] = record
+            while len(self._records) > self.history_size:
+                self._records.popitem(last=False)
+        logger.info(f"Queued job {record.job_id} from {source}: {file_path}",
+                    extra={"job_id": record.job_id})
+        return record
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Look up a job record by ID."""
+        with self._records_lock:
+            return self._records.get(job_id)
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def retry_after(self) -> int:
+        """Suggest how many seconds a rejected client should wait."""
+        return max(1, math.ceil(self._avg_duration / max(1, self.workers)))
+
+    def _work(self):
+        """Worker loop: process jobs until a stop sentinel arrives."""
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            record.status = "processing"
+            record.started_at = time.time()
+            try:
+                result = self.agent.process_job_description(record.file_path, job_id=record.job_id)
+                status = "completed" if result['status'] == 'completed' else "error"
+                error = result.get('error')
+                warning = result.get('warning')
+            except Exception as e:
+                logger.error(f"Error processing job {record.job_id}: {e}",
+                             extra={"job_id": record.job_id})
+                status, error, warning = "error", str(e), None
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.time() - record.started_at)
+            record._finish(status, error, warning)
@@ -0,0 +1,258 @@
+"""
+Load Balancer - Routing of MCP tool calls across several server endpoints.
+
+One MCP server caps throughput and is a single point of failure. An
+EndpointPool spreads calls over several replicas:
+
+- Routing picks the endpoint with the fewest outstanding calls
+  ("least_outstanding"), or the lowest latency EWMA x (outstanding + 1)
+  ("latency"), so slow replicas get proportionally less work.
+- An endpoint that fails several calls in a row is ejected for a while. A
+  background checker probes every endpoint, ejecting ones that stop
+  answering; an ejected endpoint returns once its ejection time is up, and
+  while it fails probes its ejection keeps being extended.
+- Calls tagged with a session key (the job ID) stick to the endpoint that
+  served the session first, so formatting and tailoring a job hit the same
+  replica's caches.
+"""
+
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+ROUTING_STRATEGIES = ("least_outstanding", "latency")
+
+
+def parse_endpoints(value) -> list[str]:
+    """
+    Parse MCP endpoint URLs from a comma-separated string or a list.
+
+    Args:
+        value: e.g. "http://mcp-1:8000,http://mcp-2:8000"
+
+    Returns:
+        URLs without trailing slashes, in the given order
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    urls = [url.strip().rstrip("/") for url in value if url and url.strip()]
+    if not urls:
+        raise ValueError("At least one MCP endpoint URL is required")
+    return urls
+
+
+def probe_endpoint(url: str, timeout: float = 2.0) -> bool:
+    """Return True if an HTTP server answers at url (any status counts)."""
+    try:
+        urllib.request.urlopen(url, timeout=timeout).close()
+        return True
+    except urllib.error.HTTPError:
+        # Any HTTP response means the server is up
+        return True
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+class Endpoint:
+    """Routing state of one MCP server endpoint."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.latency_ewma = None
+        self.consecutive_failures = 0
+        self.ejected_at = 0.0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.requests = 0
+        self.failures = 0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "healthy": not self.is_ejected(now),
+            "outstanding": self.outstanding,
+            "latency_ms": (
+                round(self.latency_ewma * 1000, 3) if self.latency_ewma is not None else None
+            ),
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+class EndpointPool:
+    """Chooses an endpoint for each call and tracks endpoint health."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        strategy: str = "least_outstanding",
+        eject_failures: int = 3,
+        eject_seconds: float = 30.0,
+        health_interval: float = 10.0,
+        sticky_sessions: bool = True,
+        max_sessions: int = 10000,
+        latency_alpha: float = 0.2,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            urls: Endpoint URLs
+            strategy: "least_outstanding" or "latency"
+            eject_failures: Consecutive failed calls that eject an endpoint
+            eject_seconds: Minimum time an ejected endpoint stays out
+            health_interval: Seconds between background health probes
+                (0 disables them); a failed probe ejects an endpoint, or
+                keeps an ejected one out for another eject_seconds
+            sticky_sessions: Route calls with the same session key to the
+                same endpoint while it stays healthy
+            max_sessions: Sessions remembered for stickiness (least recently
+                used are forgotten first)
+            latency_alpha: Weight of the newest sample in the latency EWMA
+        """
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown routing strategy {strategy!r}, "
+                             f"expected one of {ROUTING_STRATEGIES}")
+
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.strategy = strategy
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self.health_interval = health_interval
+        self.sticky_sessions = sticky_sessions
+        self.max_sessions = max_sessions
+        self.latency_alpha = latency_alpha
+        self._sessions: OrderedDict[str, Endpoint] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checker = None
+
+        # Nothing to balance or fail over to with a single endpoint
+        if len(self.endpoints) > 1 and health_interval > 0:
+            self._checker = threading.Thread(
+                target=self._check_health, name="mcp-health", daemon=True
+            )
+            self._checker.start()
+
+    def _cost(self, endpoint: Endpoint) -> float:
+        if self.strategy == "latency":
+            # Endpoints without samples yet look free, so they get some
+            return (endpoint.latency_ewma or 0.0) * (endpoint.outstanding + 1)
+        return endpoint.outstanding
+
+    def acquire(self, session: str | None = None, exclude: set | None = None) -> Endpoint:
+        """
+        Choose an endpoint for a call and count it as outstanding.
+
+        Args:
+            session: Session key for sticky routing (optional)
+            exclude: URLs not to choose, e.g. ones that just failed this call
+
+        Returns:
+            The endpoint; pass it to release() when the call finishes
+        """
+        now = time.monotonic()
+        with self._lock:
+            endpoint = None
+            if session is not None and self.sticky_sessions:
+                endpoint = self._sessions.get(session)
+                if endpoint is not None and (
+                    endpoint.is_ejected(now) or (exclude and endpoint.url in exclude)
+                ):
+                    endpoint = None
+
+            if endpoint is None:
+                candidates = [e for e in self.endpoints
+                              if not e.is_ejected(now) and not (exclude and e.url in exclude)]
+                if not candidates:
+                    # Everything is ejected: try the endpoint due back soonest
+                    # rather than failing outright
+                    candidates = [min(
+                        (e for e in self.endpoints if not (exclude and e.url in exclude)),
+                        key=lambda e: e.ejected_until,
+                        default=self.endpoints[0]
+                    )]
+                lowest = min(self._cost(e) for e in candidates)
+                endpoint = random.choice([e for e in candidates if self._cost(e) == lowest])
+
+            if session is not None and self.sticky_sessions:
+                self._sessions[session] = endpoint
+                self._sessions.move_to_end(session)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+        return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float, ok: bool):
+        """
+        Record a finished call.
+
+        Args:
+            endpoint: Endpoint returned by acquire()
+            latency: Seconds the call took
+            ok: False if the endpoint failed (not for errors raised by the tool)
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                if endpoint.latency_ewma is None:
+                    endpoint.latency_ewma = latency
+                else:
+                    endpoint.latency_ewma += self.latency_alpha * (latency - endpoint.latency_ewma)
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.eject_failures:
+                self._eject(endpoint, "consecutive call failures")
+
+    def _eject(self, endpoint: Endpoint, reason: str):
+        """Take an endpoint out of rotation (caller holds the lock)."""
+        if len(self.endpoints) == 1:
+            return
+        now = time.monotonic()
+        if not endpoint.is_ejected(now):
+            endpoint.ejected_at = now
+            endpoint.ejections += 1
+            logger.warning(f"Ejecting MCP endpoint {endpoint.url}: {reason}")
+        endpoint.ejected_until = now + self.eject_seconds
+
+    def _check_health(self):
+        """Probe every endpoint periodically, ejecting and readmitting them."""
+        while not self._stop.wait(self.health_interval):
+            for endpoint in self.endpoints:
+                up = probe_endpoint(endpoint.url, timeout=min(self.health_interval, 2.0))
+                now = time.monotonic()
+                with self._lock:
+                    if not up:
+                        self._eject(endpoint, "health check failed")
+                    elif endpoint.ejected_at and not endpoint.is_ejected(now):
+                        # Out for at least eject_seconds and answering again
+                        endpoint.ejected_at = 0.0
+                        endpoint.consecutive_failures = 0
+                        logger.info(f"Readmitting MCP endpoint {endpoint.url}")
+
+    def stats(self) -> list[dict]:
+        """Return health, load, latency and failure counts per endpoint."""
+        now = time.monotonic()
+        with self._lock:
+            return [endpoint.to_dict(now) for endpoint in self.endpoints]
+
+    def close(self):
+        """Stop the background health checker."""
+        self._stop.set()
+        if self._checker is not None:
+            self._checker.join()
@@ -0,0 +1,171 @@
+"""
+Logging Config - Non-blocking, structured logging for the TuneIt AI Agent.
+
+Log calls on the hot path only enqueue the record; a background listener
+thread formats it and writes it to stdout and a rotating log file. Records
+can be emitted as JSON lines carrying structured fields such as job_id,
+stage and duration_ms, passed through the standard `extra` argument. The
+job_id of the job being processed is also set in a context variable (see
+job_context), so every record logged while handling a job carries it.
+"""
+
+import atexit
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Maximum number of characters of a payload (job description, resume, tool
+# arguments) that is written to the logs; see truncate_payload.
+payload_limit = 200
+
+# Attributes present on every LogRecord; anything else was passed via `extra`
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+) | {"message", "asctime"}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# ID of the job being processed by the current thread or task
+current_job_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_job_id", default=None
+)
+
+
+@contextmanager
+def job_context(job_id: str | None):
+    """Tag log records emitted inside the block with job_id."""
+    token = current_job_id.set(job_id)
+    try:
+        yield
+    finally:
+        current_job_id.reset(token)
+
+
+class JobIdFilter(logging.Filter):
+    """Add the current job's ID to records that weren't given one via `extra`."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "job_id"):
+            job_id = current_job_id.get()
+            if job_id is not None:
+                record.job_id = job_id
+        return True
+
+
+def truncate_payload(text, limit: int | None = None) -> str:
+    """
+    Shorten a payload for logging.
+
+    Payloads longer than the limit are cut and tagged with their length and a
+    short SHA-256 hash, so the same content can still be correlated across
+    log lines without writing it out in full.
+
+    Args:
+        text: Payload to log (non-strings are converted with str())
+        limit: Maximum characters to keep (default: module payload_limit)
+
+    Returns:
+        The payload, or a truncated form of it
+    """
+    text = text if isinstance(text, str) else str(text)
+    limit = payload_limit if limit is None else limit
+    if len(text) <= limit:
+        return text
+    digest = hashlib.sha256(text.encode("utf-8", "replace")).hexdigest()[:12]
+    return f"{text[:limit]}... [truncated {len(text)} chars, sha256={digest}]"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps `extra` fields instead of pre-formatting the record."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_file: str | None = "tuneit_agent.log",
+    log_format: str = "json",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    payload_chars: int = 200,
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Args:
+        level: Root log level name
+        log_file: Path of the rotating log file (None disables file output)
+        log_format: "json" for JSON lines or "text" for the plain format
+        max_bytes: Rotate the log file when it reaches this size
+        backup_count: Number of rotated log files to keep
+        payload_chars: Characters of each payload kept by truncate_payload
+
+    Returns:
+        The started QueueListener (stopped automatically at exit)
+    """
+    global payload_limit
+    payload_limit = payload_chars
+
+    formatter = JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8"
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    queue_handler = StructuredQueueHandler(log_queue)
+    # Runs in the logging thread, where the job's context variable is set
+    queue_handler.addFilter(JobIdFilter())
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -51,6 +51,8 @@ class MockMCPHandler(BaseHTTPRequestHandler):
                 response = self._save_tailored_resume(arguments)
             elif tool_name == 'save_job_description':
                 response = self._save_job_description(arguments)
+            elif tool_name == 'batch':
+                response = self._batch(arguments)
             else:
                 self.send_error(404, f"Unknown tool: {tool_name}")
                 return
@@ -158,6 +160,38 @@ TECHNICAL SKILLS
             "filename": f"{job_title}_job_description.txt"
         }
     
+    def _batch(self, arguments):
+        """Mock batch tool: runs a list of calls to one tool in a single request."""
+        handlers = {
+            'format_job_description': self._format_job_description,
+            'format_to_markdown': self._format_job_description,
+            'generate_tailored_resume': self._generate_tailored_resume,
+            'tailor_resume': self._generate_tailored_resume,
+            'save_tailored_resume': self._save_tailored_resume,
+            'save_job_description': self._save_job_description,
+            'save_job': self._save_job_description,
+        }
+        tool_name = arguments.get('tool', '')
+        calls = arguments.get('calls', [])
+        handler = handlers.get(tool_name)
+        if handler is None:
+            return {"status": "error", "error": f"Unknown tool: {tool_name}"}
+        
+        logger.info(f"Mock batch of {len(calls)} call(s) to: {tool_name}")
+        
+        # One entry per call, in the same form as a single call's response
+        # body (JSON text), or {"error": ...} for a call that failed
+        results = []
+        for call in calls:
+            try:
+                results.append(json.dumps(handler(call)))
+            except Exception as e:
+                results.append({"error": str(e)})
+        return {
+            "results": results,
+            "status": "success"
+        }
+    
     def log_message(self, format, *args):
         """Override to use custom logger."""
         logger.info(f"{self.address_string()} - {format % args}")
@@ -179,6 +213,7 @@ def main():
     logger.info("  - POST /tools/generate_tailored_resume")
     logger.info("  - POST /tools/save_tailored_resume")
     logger.info("  - POST /tools/save_job_description")
+    logger.info("  - POST /tools/batch")
     logger.info("")
     logger.info("Press Ctrl+C to stop")
     logger.info("=" * 60)
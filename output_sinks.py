@@ -0,0 +1,248 @@
+"""
+Output Sinks - Pluggable backends for saving formatted job descriptions and resumes.
+
+MCPOutputSink saves through the MCP server's save tools (the original
+behaviour). LocalOutputSink writes straight to a local directory, which
+avoids two network round trips per job when the MCP save tools aren't needed.
+ArchiveOutputSink keeps every version in a compressed, deduplicated
+ArtifactStore instead of plain files.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class MCPOutputSink:
+    """Saves outputs with the MCP server's save_job and save_tailored_resume tools."""
+
+    def __init__(self, mcp_client):
+        """
+        Initialize the sink.
+
+        Args:
+            mcp_client: MCPClient used to call the save tools
+        """
+        self.mcp_client = mcp_client
+
+    def save_job_description(self, job_description: str, job_title: str) -> str:
+        """Save the formatted job description."""
+        return self.mcp_client.save_job_description(job_description, job_title)
+
+    def save_tailored_resume(self, resume_content: str, job_title: str) -> str:
+        """Save the tailored resume."""
+        return self.mcp_client.save_tailored_resume(resume_content, job_title)
+
+    def close(self):
+        """Nothing to release; the MCP client is owned by the agent."""
+
+
+class _GroupSync:
+    """
+    Group commit of files written by concurrent jobs.
+
+    Each writer fsyncs its own temp file in its own thread, in parallel with
+    the others, then joins the pending group. The first writer to join leads
+    the group: while other writers are still writing it waits (at most one
+    window) for them to join, then renames every pending file into place and
+    fsyncs each affected directory once for the whole group. A writer with
+    no one else writing commits immediately.
+    """
+
+    def __init__(self, window_ms: float):
+        self.window = window_ms / 1000
+        self._cond = threading.Condition()
+        self._pending = []
+        self._leader_active = False
+        self._writing = 0
+
+    def begin(self):
+        """Announce a write that will be committed (or aborted) shortly."""
+        with self._cond:
+            self._writing += 1
+
+    def abort(self):
+        """Withdraw a write announced with begin() that won't be committed."""
+        with self._cond:
+            self._writing -= 1
+            self._cond.notify_all()
+
+    def commit(self, tmp_path: str, final_path: str):
+        """Durably move tmp_path to final_path, grouped with concurrent commits."""
+        try:
+            _fsync_path(tmp_path)
+        except BaseException:
+            self.abort()
+            raise
+
+        entry = {"tmp": tmp_path, "final": final_path, "done": threading.Event(), "error": None}
+        with self._cond:
+            self._writing -= 1
+            self._pending.append(entry)
+            leader = not self._leader_active
+            self._leader_active = True
+            self._cond.notify_all()
+            if leader:
+                deadline = time.monotonic() + self.window
+                while self._writing > 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._leader_active = False
+
+        if leader:
+            self._flush(batch)
+
+        entry["done"].wait()
+        if entry["error"] is not None:
+            raise entry["error"]
+
+    def _flush(self, batch: list[dict]):
+        """Rename one group of synced files and fsync their directories."""
+        directories = {}
+        for entry in batch:
+            try:
+                os.replace(entry["tmp"], entry["final"])
+                directories.setdefault(os.path.dirname(entry["final"]), []).append(entry)
+            except OSError as e:
+                entry["error"] = e
+                _remove_quietly(entry["tmp"])
+
+        for directory, entries in directories.items():
+            try:
+                _fsync_path(directory)
+            except OSError as e:
+                for entry in entries:
+                    entry["error"] = e
+
+        for entry in batch:
+            entry["done"].set()
+        logger.debug(f"Group sync committed {len(batch)} file(s)")
+
+
+def _fsync_path(path: str):
+    """fsync a file or directory by path."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: str):
+    """Remove a file, ignoring errors."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class LocalOutputSink:
+    """Writes outputs atomically into a sharded local directory tree."""
+
+    JOB_DESCRIPTIONS_DIR = "job_descriptions"
+    RESUMES_DIR = "resumes"
+
+    def __init__(
+        self,
+        output_directory: str,
+        shard_chars: int = 2,
+        fsync: bool = True,
+        fsync_window_ms: float = 2.0,
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            output_directory: Root directory for saved outputs
+            shard_chars: Hex characters of the filename hash used as the
+                shard directory name (0 disables sharding)
+            fsync: Make each file durable before reporting it saved
+            fsync_window_ms: How long a commit waits for concurrent writes to
+                share its fsyncs
+        """
+        self.output_directory = Path(output_directory)
+        self.shard_chars = shard_chars
+        self.group_sync = _GroupSync(fsync_window_ms) if fsync else None
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Local output sink writing to: {self.output_directory}")
+
+    def path_for(self, kind: str, filename: str) -> Path:
+        """Return the sharded path of an output file."""
+        directory = self.output_directory / kind
+        if self.shard_chars > 0:
+            shard = hashlib.sha1(filename.encode("utf-8")).hexdigest()[:self.shard_chars]
+            directory = directory / shard
+        return directory / f"{filename}.md"
+
+    def _write(self, kind: str, filename: str, content: str) -> str:
+        """Write content to a temp file and atomically rename it into place."""
+        path = self.path_for(kind, filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        # Concurrent commits wait for writes announced here to join their group
+        announced = self.group_sync is not None
+        if announced:
+            self.group_sync.begin()
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            if self.group_sync is not None:
+                announced = False
+                self.group_sync.commit(tmp_path, str(path))
+            else:
+                os.replace(tmp_path, path)
+        except BaseException:
+            if announced:
+                self.group_sync.abort()
+            _remove_quietly(tmp_path)
+            raise
+
+        logger.debug(f"Wrote {path}")
+        return str(path)
+
+    def save_job_description(self, job_description: str, job_title: str) -> str:
+        """Save the formatted job description."""
+        return self._write(self.JOB_DESCRIPTIONS_DIR, job_title, job_description)
+
+    def save_tailored_resume(self, resume_content: str, job_title: str) -> str:
+        """Save the tailored resume."""
+        return self._write(self.RESUMES_DIR, job_title, resume_content)
+
+    def close(self):
+        """Nothing to release; every write is committed before it returns."""
+
+
+class ArchiveOutputSink:
+    """Saves outputs as versions in a compressed, content-addressed ArtifactStore."""
+
+    def __init__(self, store):
+        """
+        Initialize the sink.
+
+        Args:
+            store: ArtifactStore the outputs are written to
+        """
+        self.store = store
+
+    def save_job_description(self, job_description: str, job_title: str) -> str:
+        """Save the formatted job description."""
+        return self.store.put(LocalOutputSink.JOB_DESCRIPTIONS_DIR, job_title, job_description)
+
+    def save_tailored_resume(self, resume_content: str, job_title: str) -> str:
+        """Save the tailored resume."""
+        return self.store.put(LocalOutputSink.RESUMES_DIR, job_title, resume_content)
+
+    def close(self):
+        """Log archive stats and close the store."""
+        logger.info(f"Artifact store stats: {self.store.stats()}")
+        self.store.close()
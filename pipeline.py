@@ -0,0 +1,300 @@
+"""
+Pipeline - Stage-pipelined execution of the TuneIt workflow.
+
+Instead of running read, format, generate and save end to end for one job at
+a time, each stage gets its own bounded queue and worker pool. Formatting
+job N+1 overlaps with tailoring job N, and each pool can be sized to its
+stage's latency. Per-stage utilization is tracked so pools can be tuned.
+
+The stages run the same node functions as the LangGraph workflow, so logs,
+profiling and results are the same in both modes.
+"""
+
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+
+from job_queue import JobQueue, JobRecord
+from logging_config import job_context
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("read", "format", "generate", "save")
+DEFAULT_POOL_SIZES = {"read": 1, "format": 4, "generate": 8, "save": 2}
+
+
+def parse_pool_sizes(value: str | None) -> dict[str, int]:
+    """
+    Parse per-stage worker counts from a "stage=N,stage=N" string.
+
+    Args:
+        value: Pool sizes, e.g. from the PIPELINE_WORKERS variable
+
+    Returns:
+        DEFAULT_POOL_SIZES updated with the given sizes
+    """
+    sizes = dict(DEFAULT_POOL_SIZES)
+    if not value or not value.strip():
+        return sizes
+    for entry in value.split(","):
+        stage, sep, count = entry.partition("=")
+        stage = stage.strip()
+        if not sep or stage not in STAGES or not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid pipeline pool size {entry!r}, expected stage=N "
+                             f"with stage in {STAGES}")
+        sizes[stage] = int(count)
+    return sizes
+
+
+class Stage:
+    """A bounded queue drained by a pool of worker threads."""
+
+    def __init__(self, name: str, handler, workers: int, work_queue: queue.Queue, on_error=None):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name used in thread names and stats
+            handler: Called with each queued item
+            workers: Number of worker threads
+            work_queue: Queue the workers take items from
+            on_error: Called with (item, exception) when the handler raises
+        """
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.workers = workers
+        self.queue = work_queue
+        self._threads = []
+        self._lock = threading.Lock()
+        self._busy_seconds = 0.0
+        self._items = 0
+        self._started_at = None
+
+    def start(self):
+        """Start the worker threads."""
+        self._started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"stage-{self.name}-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Process everything already queued, then stop the workers."""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def _work(self):
+        """Worker loop: handle items until a stop sentinel arrives."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            start = time.perf_counter()
+            try:
+                self.handler(item)
+            except Exception as e:
+                # Keep the worker alive; one bad item must not shrink the pool
+                logger.error(f"Unhandled error in {self.name} stage: {e}", exc_info=True)
+                if self.on_error is not None:
+                    try:
+                        self.on_error(item, e)
+                    except Exception as callback_error:
+                        logger.error(f"Error handling {self.name} stage failure: {callback_error}")
+            finally:
+                with self._lock:
+                    self._busy_seconds += time.perf_counter() - start
+                    self._items += 1
+
+    def stats(self) -> dict:
+        """Return items processed, queue depth and worker utilization."""
+        with self._lock:
+            busy, items = self._busy_seconds, self._items
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "items": items,
+            "queued": self.queue.qsize(),
+            "avg_ms": round(busy / items * 1000, 3) if items else 0.0,
+            "utilization": round(busy / (elapsed * self.workers), 4) if elapsed else 0.0,
+        }
+
+
+class PipelinedJobQueue(JobQueue):
+    """JobQueue that runs each workflow stage in its own worker pool."""
+
+    def __init__(
+        self,
+        agent,
+        max_size: int = 100,
+        pool_sizes: dict[str, int] | None = None,
+        stage_queue_size: int = 16,
+        history_size: int = 10000,
+    ):
+        """
+        Initialize the pipelined job queue.
+
+        Args:
+            agent: TuneItAgent whose workflow nodes the stages run
+            max_size: Maximum number of jobs waiting for the read stage
+            pool_sizes: Worker count per stage (default: DEFAULT_POOL_SIZES)
+            stage_queue_size: Capacity of the queues between stages
+            history_size: Number of job records kept for status lookups
+        """
+        pool_sizes = {**DEFAULT_POOL_SIZES, **(pool_sizes or {})}
+        # The generate stage dominates job latency, so it sets the pace used
+        # for Retry-After estimates
+        super().__init__(agent, max_size=max_size, workers=pool_sizes["generate"],
+                         history_size=history_size)
+
+        self._read = agent._timed("read_job_description", agent._read_job_description)
+        self._format = agent._timed("format_job_description", agent._format_job_description)
+        self._generate = agent._timed("generate_resume", agent._generate_tailored_resume)
+        self._save = agent._timed("save_outputs", agent._save_outputs)
+
+        handlers = {
+            "read": self._handle_read,
+            "format": self._handle_format,
+            "generate": self._handle_generate,
+            "save": self._handle_save,
+        }
+        self.stages = {}
+        for name in STAGES:
+            # Jobs are submitted straight into the read stage's queue
+            work_queue = self._queue if name == "read" else queue.Queue(maxsize=stage_queue_size)
+            self.stages[name] = Stage(name, self._in_job_context(handlers[name]),
+                                      pool_sizes[name], work_queue,
+                                      on_error=self._stage_failed)
+
+    def start(self):
+        """Start every stage's worker pool."""
+        for stage in self.stages.values():
+            stage.start()
+        logger.info("Pipelined job queue started with pools: " + ", ".join(
+            f"{name}={stage.workers}" for name, stage in self.stages.items()
+        ))
+
+    def stop(self):
+        """Cancel jobs not yet started, drain the stages in order and stop their workers."""
+        self._cancel_pending()
+        for stage in self.stages.values():
+            stage.stop()
+        logger.info(f"Pipelined job queue stopped; stage stats: {self.stage_stats()}")
+
+    def stage_stats(self) -> list[dict]:
+        """Return per-stage items, queue depth and worker utilization."""
+        return [stage.stats() for stage in self.stages.values()]
+
+    def _complete(self, record: JobRecord, state: dict):
+        """Finish a job that completed or failed at any stage."""
+        profiler = self.agent.profiler
+        if profiler:
+            profiler.finish_job(record.job_id)
+
+        duration = time.time() - record.started_at
+        self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+        timing = {"job_id": record.job_id, "duration_ms": round(duration * 1000, 3)}
+        if state['status'] == 'completed':
+            logger.info(f"Successfully processed: {record.file_path}", extra=timing)
+            record._finish("completed", None, state.get('warning'))
+        else:
+            logger.error(f"Processing failed for {record.file_path}: {state.get('error')}",
+                         extra=timing)
+            record._finish("error", state.get('error'))
+
+    def _fail(self, record: JobRecord, state: dict, error: Exception):
+        """Finish a job after an unexpected error in a stage."""
+        logger.error(f"Unexpected error processing {record.file_path}: {error}",
+                     extra={"job_id": record.job_id})
+        state['error'] = str(error)
+        state['status'] = 'error'
+        self._complete(record, state)
+
+    @staticmethod
+    def _record_of(item) -> JobRecord:
+        """Return the job record of a stage queue item."""
+        return item if isinstance(item, JobRecord) else item[0]
+
+    def _in_job_context(self, handler):
+        """Wrap a stage handler so its log records carry the item's job ID."""
+        def handle(item):
+            with job_context(self._record_of(item).job_id):
+                handler(item)
+        return handle
+
+    def _stage_failed(self, item, error: Exception):
+        """Finish the job of an item whose stage handler raised."""
+        record = self._record_of(item)
+        if not record.done:
+            record._finish("error", str(error))
+
+    def _handle_read(self, record: JobRecord):
+        record.status = "processing"
+        record.started_at = time.time()
+        state = self.agent._initial_state(record.file_path, record.job_id)
+        try:
+            profiler = self.agent.profiler
+            if profiler:
+                profiler.start_job(record.job_id, Path(record.file_path).stem)
+            state = self._read(state)
+        except Exception as e:
+            self._fail(record, state, e)
+            return
+        if state['status'] == 'error':
+            self._complete(record, state)
+            return
+        self.stages["format"].queue.put((record, state))
+
+    def _handle_format(self, item):
+        record, state = item
+        try:
+            state = self._format(state)
+        except Exception as e:
+            self._fail(record, state, e)
+            return
+        if state['status'] == 'error':
+            self._complete(record, state)
+            return
+
+        # Fan out one generate item per profile; the last one to finish
+        # fans back in to the save stage
+        fan_in = {"pending": len(self.agent.profiles), "lock": threading.Lock()}
+        for profile in self.agent.profiles:
+            self.stages["generate"].queue.put((record, state, fan_in, profile))
+
+    def _handle_generate(self, item):
+        record, state, fan_in, profile = item
+        try:
+            update = self._generate({
+                "job_id": record.job_id,
+                "profile": profile,
+                "formatted_job_description": state['formatted_job_description'],
+            })
+        except Exception as e:
+            update = {"profile_errors": {profile.name: str(e)}}
+
+        with fan_in["lock"]:
+            state['tailored_resumes'].update(update.get('tailored_resumes', {}))
+            state['profile_errors'].update(update.get('profile_errors', {}))
+            state['base_resume_hashes'].update(update.get('base_resume_hashes', {}))
+            fan_in["pending"] -= 1
+            last = fan_in["pending"] == 0
+        if last:
+            self.stages["save"].queue.put((record, state))
+
+    def _handle_save(self, item):
+        record, state = item
+        try:
+            state = self._save(state)
+        except Exception as e:
+            self._fail(record, state, e)
+            return
+        self._complete(record, state)
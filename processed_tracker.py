@@ -0,0 +1,187 @@
+"""
+Processed Tracker - Bounded record of job description files already handled.
+
+This module keeps a compact, fixed-memory history of processed files so the
+file watcher can skip duplicates without growing for the life of the process.
+Each entry is a 16-byte digest of the file path plus a fingerprint of its
+content, so a new file that reuses an old name is still processed.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 16
+FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(file_path: str) -> bytes:
+    """
+    Build a fixed-size key for a file from its path and content.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        A DIGEST_SIZE-byte digest of the resolved path and file content
+    """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(str(Path(file_path).resolve()).encode("utf-8"))
+    hasher.update(b"\0")
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(FINGERPRINT_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over DIGEST_SIZE-byte keys."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize the Bloom filter.
+
+        Args:
+            capacity: Expected number of keys before the error rate degrades
+            error_rate: Target false positive rate at full capacity
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        """Yield bit positions for a key using double hashing."""
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: bytes):
+        """Add a key to the filter."""
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class ProcessedFileTracker:
+    """
+    Bounded LRU set of processed file digests with an optional Bloom tier.
+
+    Recent entries live in an LRU map and can be discarded again (e.g. so a
+    failed file can be retried). Entries evicted by size or age are moved to
+    the Bloom tier when one is configured, which keeps a probabilistic
+    record of a very large history in constant memory.
+
+    The Bloom tier has two generations of bloom_capacity keys each. When the
+    current filter is full it becomes the previous one and a fresh filter
+    takes over, so the false positive rate stays near 2 x bloom_error_rate
+    instead of climbing as the history grows; the oldest generation is
+    forgotten at each rotation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float | None = None,
+        bloom_capacity: int = 0,
+        bloom_error_rate: float = 0.001,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_entries: Maximum number of digests kept in the LRU tier
+            ttl_seconds: Evict LRU entries older than this (None disables)
+            bloom_capacity: Keys per Bloom generation (0 disables the tier)
+            bloom_error_rate: Target false positive rate of each generation
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity > 0 else None
+        self.previous_bloom = None
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        """Evict expired and overflowing entries into the Bloom tier."""
+        while self._entries:
+            key, added_at = next(iter(self._entries.items()))
+            expired = self.ttl_seconds is not None and now - added_at > self.ttl_seconds
+            if not expired and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+            if self.bloom is not None:
+                if self.bloom.count >= self.bloom_capacity:
+                    self.previous_bloom = self.bloom
+                    self.bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+                self.bloom.add(key)
+
+    def _in_bloom(self, key: bytes) -> bool:
+        """Check both Bloom generations."""
+        if self.bloom is None:
+            return False
+        return key in self.bloom or (self.previous_bloom is not None and key in self.previous_bloom)
+
+    def add(self, key: bytes) -> bool:
+        """
+        Record a digest as processed.
+
+        Args:
+            key: Digest returned by file_digest
+
+        Returns:
+            True if the digest was new, False if it was already recorded
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            if key in self._entries:
+                # Re-touched entries are fresh again, keeping the LRU ordered by time
+                self._entries[key] = now
+                self._entries.move_to_end(key)
+                return False
+            if self._in_bloom(key):
+                logger.info(f"Digest {key.hex()} matched the Bloom tier; treating it as "
+                            f"processed (possible false positive)")
+                return False
+            self._entries[key] = now
+            self._evict(now)
+            return True
+
+    def discard(self, key: bytes):
+        """Forget a digest so the same file can be processed again."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            self._evict(time.monotonic())
+            if key in self._entries:
+                return True
+            return self._in_bloom(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,172 @@
+"""
+Profiling - On-demand CPU and memory profiling of sampled jobs.
+
+When enabled, a configurable fraction of jobs is run under cProfile (CPU)
+and tracemalloc (memory). Each sampled job writes its own files, tagged with
+the job description's file name:
+
+    <stem>_<job_id>.prof        pstats data; open with snakeviz, or render a
+                                flame graph with flameprof or gprof2dot
+    <stem>_<job_id>.memory.txt  peak traced memory and top allocation sites
+
+When profiling is disabled nothing is wrapped, so jobs pay only for a
+dictionary lookup per stage.
+
+On Python 3.12+ cProfile is built on sys.monitoring and only one profiler
+can be active in the process at a time. Stages that start while another
+profiler is running (a parallel branch, or a concurrently sampled job) then
+run unprofiled instead of failing, and the count is noted in the profile.
+"""
+
+import cProfile
+import logging
+import pstats
+import random
+import threading
+import tracemalloc
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+TOP_ALLOCATIONS = 50
+
+
+class ProfiledJob:
+    """Profiles collected for one sampled job, possibly across threads."""
+
+    def __init__(self, job_id: str, tag: str):
+        self.job_id = job_id
+        self.tag = tag
+        self.profiles: list[cProfile.Profile] = []
+        self.unprofiled_stages = 0
+        self._lock = threading.Lock()
+        # Set while this job's profiler is running in the current thread
+        self._active = threading.local()
+
+    def run(self, func, *args):
+        """Run func under cProfile unless this job is already profiling this thread."""
+        # Stages run inline in the job's thread are captured by the outer
+        # profile; only branches started on pool threads need their own
+        if getattr(self._active, "on", False):
+            return func(*args)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active (Python 3.12+ allows only one)
+            with self._lock:
+                self.unprofiled_stages += 1
+            return func(*args)
+        self._active.on = True
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            self._active.on = False
+            with self._lock:
+                self.profiles.append(profile)
+
+
+class JobProfiler:
+    """Samples jobs for CPU and memory profiling."""
+
+    def __init__(
+        self,
+        output_directory: str = "./profiles",
+        sample_rate: float = 1.0,
+        trace_memory: bool = True,
+        enabled: bool = False,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_directory: Where profile files are written
+            sample_rate: Fraction of jobs profiled while enabled (0.0 - 1.0)
+            trace_memory: Also trace allocations with tracemalloc
+            enabled: Start with profiling turned on
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.output_directory = Path(output_directory)
+        self.sample_rate = sample_rate
+        self.trace_memory = trace_memory
+        self.enabled = enabled
+        self._jobs: dict[str, ProfiledJob] = {}
+        self._lock = threading.Lock()
+        self._tracing_jobs = 0
+
+    def toggle(self) -> bool:
+        """Switch profiling on or off and return the new state."""
+        self.enabled = not self.enabled
+        logger.info(f"Job profiling {'enabled' if self.enabled else 'disabled'}")
+        return self.enabled
+
+    def start_job(self, job_id: str, tag: str) -> ProfiledJob | None:
+        """
+        Decide whether to profile a job and start tracing it if so.
+
+        Args:
+            job_id: ID of the job
+            tag: Name used in the profile file names (e.g. the file stem)
+
+        Returns:
+            The ProfiledJob if the job was sampled, otherwise None
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+
+        job = ProfiledJob(job_id, tag)
+        with self._lock:
+            self._jobs[job_id] = job
+            if self.trace_memory:
+                if self._tracing_jobs == 0:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                    tracemalloc.reset_peak()
+                self._tracing_jobs += 1
+        logger.info(f"Profiling job {job_id}", extra={"job_id": job_id})
+        return job
+
+    def get(self, job_id: str | None) -> ProfiledJob | None:
+        """Return the ProfiledJob for a job ID if it is being profiled."""
+        return self._jobs.get(job_id) if job_id else None
+
+    def finish_job(self, job_id: str):
+        """Write a sampled job's profile files and stop tracing it."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return
+            snapshot = None
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                self._tracing_jobs -= 1
+                if self._tracing_jobs == 0:
+                    tracemalloc.stop()
+
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        base = self.output_directory / f"{job.tag}_{job.job_id}"
+
+        if job.profiles:
+            stats = pstats.Stats(job.profiles[0])
+            for profile in job.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f"{base}.prof")
+        if job.unprofiled_stages:
+            logger.info(f"{job.unprofiled_stages} stage(s) of job {job.job_id} ran unprofiled "
+                        f"because another profiler was active", extra={"job_id": job.job_id})
+
+        if snapshot is not None:
+            # Concurrent jobs share the tracer, so overlapping jobs' allocations
+            # are included as well
+            with open(f"{base}.memory.txt", "w", encoding="utf-8") as f:
+                f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n")
+                f.write(f"Top {TOP_ALLOCATIONS} allocation sites:\n")
+                for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+
+        logger.info(f"Wrote profile for job {job.job_id}: {base}.*",
+                    extra={"job_id": job.job_id})
@@ -0,0 +1,91 @@
+"""
+Retailor - Incremental re-tailoring of past jobs after a base resume changes.
+
+`python run.py retailor` reads the job history, works out which saved resumes
+were generated from an older version of their profile's base resume, and
+re-runs only tailoring and saving for those, reusing each job's stored
+formatted job description. Jobs are tailored concurrently, and each finished
+resume is recorded in the history as soon as it is saved, so an interrupted
+run picks up where it left off.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from job_history import content_hash
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVERY = 50
+
+
+def retailor(agent, history, concurrency: int = 16, stop_event: threading.Event | None = None) -> dict:
+    """
+    Re-tailor every resume whose base resume has changed since it was saved.
+
+    Args:
+        agent: TuneItAgent providing the MCP client and output sink
+        history: JobHistory the agent records processed jobs in
+        concurrency: Maximum number of resumes tailored at once
+        stop_event: Stop submitting new work once set (work in flight finishes)
+
+    Returns:
+        Counts of stale, retailored and failed resumes
+    """
+    work = []
+    for profile in agent.profiles:
+        with open(profile.base_resume_path, "r", encoding="utf-8") as f:
+            base_resume = f.read()
+        base_resume_hash = content_hash(base_resume)
+        stale = history.stale_jobs(profile.name, base_resume_hash)
+        logger.info(f"Profile {profile.name}: {len(stale)} resume(s) out of date")
+        work.extend((job_title, profile, base_resume) for job_title in stale)
+
+    counts = {"stale": len(work), "retailored": 0, "failed": 0}
+    if not work:
+        logger.info("All tailored resumes are up to date")
+        return counts
+
+    def run_one(job_title, profile, base_resume):
+        formatted = history.get_formatted(job_title)
+        resume, base_resume_hash = agent.tailor_resume(formatted, profile, base_resume)
+        # Saved and recorded together, so a rerun skips it only once it is on disk
+        agent.save_resume(job_title, profile, resume, base_resume_hash)
+
+    start = time.perf_counter()
+    pending = {}
+    items = iter(work)
+    reported = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="retailor") as executor:
+        while True:
+            # Keep at most `concurrency` items in flight rather than queueing
+            # the whole backlog up front
+            while len(pending) < concurrency and not (stop_event and stop_event.is_set()):
+                item = next(items, None)
+                if item is None:
+                    break
+                pending[executor.submit(run_one, *item)] = item
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job_title, profile, _ = pending.pop(future)
+                try:
+                    future.result()
+                    counts["retailored"] += 1
+                    logger.info(f"Retailored {profile.name}_{job_title}")
+                except Exception as e:
+                    counts["failed"] += 1
+                    logger.error(f"Error retailoring {profile.name}_{job_title}: {e}")
+
+            finished = counts["retailored"] + counts["failed"]
+            if finished - reported >= PROGRESS_EVERY:
+                reported = finished
+                logger.info(f"Retailor progress: {finished}/{counts['stale']}")
+
+    counts["duration_s"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Retailor finished: {counts}")
+    return counts
@@ -8,78 +8,319 @@ monitors for new job description files and processes them.
 
 import os
 import sys
+import argparse
 import logging
 import signal
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 
-from agent import TuneItAgent
-from file_watcher import FileWatcher
+from load_balancer import parse_endpoints, probe_endpoint
+from logging_config import setup_logging
+from processed_tracker import ProcessedFileTracker
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('tuneit_agent.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+def configure_logging(log_to_file: bool = True):
+    """
+    Configure queue-based logging from the environment.
+
+    Args:
+        log_to_file: Also write to LOG_FILE (off for probes such as
+            --healthcheck, which must not fill the service's log)
+    """
+    setup_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        log_file=(os.getenv("LOG_FILE", "tuneit_agent.log") or None) if log_to_file else None,
+        log_format=os.getenv("LOG_FORMAT", "json"),
+        max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+        payload_chars=int(os.getenv("LOG_PAYLOAD_CHARS", "200")),
+    )
+
+
 class BackgroundRunner:
     """Background service runner for the TuneIt AI Agent."""
     
-    def __init__(self):
-        """Initialize the background runner."""
+    def __init__(self, profile: bool = False):
+        """
+        Initialize the background runner.
+        
+        Args:
+            profile: Start with job profiling enabled
+        """
         self.agent = None
         self.watcher = None
+        self.job_queue = None
+        self.ingest_server = None
         self.running = False
         
         # Get configuration from environment
         self.mcp_url = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
+        self.resume_profiles = os.getenv("RESUME_PROFILES", "")
+        self.output_backend = os.getenv("OUTPUT_BACKEND", "mcp").lower()
+        self.output_directory = os.getenv("OUTPUT_DIRECTORY", "./output")
+        self.output_fsync = os.getenv("OUTPUT_FSYNC", "true").lower() in ("1", "true", "yes")
+        self.output_fsync_window_ms = float(os.getenv("OUTPUT_FSYNC_WINDOW_MS", "2"))
+        self.archive_directory = os.getenv("ARCHIVE_DIRECTORY", "./archive")
+        self.archive_compression = os.getenv("ARCHIVE_COMPRESSION", "zstd").lower()
+        archive_level = os.getenv("ARCHIVE_LEVEL")
+        self.archive_level = int(archive_level) if archive_level else None
+        self.mcp_options = {
+            "batch_window_ms": float(os.getenv("MCP_BATCH_WINDOW_MS", "0")),
+            "batch_max_size": int(os.getenv("MCP_BATCH_MAX_SIZE", "8")),
+            "batch_tools": tuple(
+                os.getenv("MCP_BATCH_TOOLS", "format_to_markdown,tailor_resume").split(",")
+            ),
+            "routing": os.getenv("MCP_ROUTING", "least_outstanding").lower(),
+            "sticky_sessions": os.getenv("MCP_STICKY_SESSIONS", "true").lower() in ("1", "true", "yes"),
+            "eject_failures": int(os.getenv("MCP_EJECT_FAILURES", "3")),
+            "eject_seconds": float(os.getenv("MCP_EJECT_SECONDS", "30")),
+            "health_interval": float(os.getenv("MCP_HEALTH_INTERVAL", "10")),
+        }
+        self.max_input_bytes = int(os.getenv("MAX_JOB_DESCRIPTION_BYTES", str(2 * 1024 * 1024)))
+        self.format_chunk_chars = int(os.getenv("FORMAT_CHUNK_CHARS", "12000"))
+        self.format_concurrency = int(os.getenv("FORMAT_CHUNK_CONCURRENCY", "4"))
+        self.token_budget_per_minute = float(os.getenv("TOKEN_BUDGET_PER_MINUTE", "0"))
+        self.token_budget_burst = float(os.getenv("TOKEN_BUDGET_BURST", "0"))
         self.watch_directory = os.getenv("WATCH_DIRECTORY", "./job_descriptions")
         self.allowed_extensions = os.getenv(
             "ALLOWED_EXTENSIONS", 
             ".txt,.md,.pdf"
         ).split(",")
+        self.processed_cache_size = int(os.getenv("PROCESSED_CACHE_SIZE", "10000"))
+        processed_cache_ttl = os.getenv("PROCESSED_CACHE_TTL")
+        self.processed_cache_ttl = float(processed_cache_ttl) if processed_cache_ttl else None
+        self.processed_bloom_capacity = int(os.getenv("PROCESSED_BLOOM_CAPACITY", "0"))
+        self.job_queue_size = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+        self.job_workers = int(os.getenv("JOB_WORKERS", "1"))
+        self.execution_mode = os.getenv("EXECUTION_MODE", "sequential").lower()
+        self.pipeline_workers = os.getenv("PIPELINE_WORKERS", "")
+        self.pipeline_queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", "16"))
+        self.ingest_port = os.getenv("INGEST_PORT", "")
+        self.ingest_host = os.getenv("INGEST_HOST", "127.0.0.1")
+        self.ingest_directory = os.getenv("INGEST_DIRECTORY", "./ingested")
+        self.ingest_max_bytes = int(os.getenv("INGEST_MAX_BYTES", str(1024 * 1024)))
+        self.profile = profile
+        self.profile_sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+        self.profile_directory = os.getenv("PROFILE_DIRECTORY", "./profiles")
+        self.profile_memory = os.getenv("PROFILE_MEMORY", "true").lower() in ("1", "true", "yes")
+        self.job_history_db = os.getenv("JOB_HISTORY_DB", "./tuneit_history.db")
+        self.retailor_concurrency = int(os.getenv("RETAILOR_CONCURRENCY", "16"))
         
         logger.info("Background runner initialized")
         logger.info(f"MCP Server URL: {self.mcp_url}")
         logger.info(f"Watch Directory: {self.watch_directory}")
+        logger.info(f"Output Backend: {self.output_backend}")
         logger.info(f"Allowed Extensions: {self.allowed_extensions}")
     
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown."""
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._toggle_profiling)
+    
+    def _toggle_profiling(self, signum, frame):
+        """Turn job profiling on or off at runtime (SIGUSR1)."""
+        if self.agent and self.agent.profiler:
+            self.agent.profiler.toggle()
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         logger.info(f"Received signal {signum}, shutting down...")
         self.stop()
     
+    def healthcheck(self, timeout: float = 2.0) -> bool:
+        """
+        Check that an MCP endpoint answers and the watch directory is usable.
+        
+        This does not import the agent or LangGraph, so it is cheap enough to
+        use as a container readiness or liveness probe.
+        
+        Args:
+            timeout: Seconds to wait for the MCP endpoint
+            
+        Returns:
+            True if all checks passed
+        """
+        healthy = True
+        
+        # With several endpoints, one reachable replica is enough to serve
+        reachable = 0
+        for url in parse_endpoints(self.mcp_url):
+            if probe_endpoint(url, timeout):
+                logger.info(f"MCP endpoint reachable: {url}")
+                reachable += 1
+            else:
+                logger.error(f"MCP endpoint unreachable: {url}")
+        if not reachable:
+            healthy = False
+        
+        watch_path = Path(self.watch_directory)
+        if not watch_path.is_dir():
+            logger.error(f"Watch directory does not exist: {self.watch_directory}")
+            healthy = False
+        elif not os.access(watch_path, os.R_OK | os.X_OK):
+            logger.error(f"Watch directory is not readable: {self.watch_directory}")
+            healthy = False
+        else:
+            logger.info(f"Watch directory ok: {self.watch_directory}")
+        
+        return healthy
+    
+    def create_output_sink(self):
+        """Create the configured output sink (None means the MCP save tools)."""
+        if self.output_backend == "mcp":
+            return None
+        if self.output_backend == "local":
+            from output_sinks import LocalOutputSink
+            
+            return LocalOutputSink(
+                self.output_directory,
+                fsync=self.output_fsync,
+                fsync_window_ms=self.output_fsync_window_ms
+            )
+        if self.output_backend == "archive":
+            from output_sinks import ArchiveOutputSink
+            
+            return ArchiveOutputSink(self.create_artifact_store())
+        raise ValueError(f"Unknown OUTPUT_BACKEND: {self.output_backend}")
+    
+    def create_artifact_store(self):
+        """Open the artifact store used by the archive output backend."""
+        from artifact_store import ArtifactStore
+        
+        return ArtifactStore(
+            self.archive_directory,
+            compression=self.archive_compression,
+            level=self.archive_level,
+            fsync=self.output_fsync
+        )
+    
+    def export_archive(self, destination: str, all_versions: bool = False) -> bool:
+        """Export the artifact store to plain files, then exit."""
+        store = self.create_artifact_store()
+        try:
+            store.export(destination, all_versions=all_versions)
+            logger.info(f"Artifact store stats: {store.stats()}")
+        finally:
+            store.close()
+        return True
+    
+    def train_dictionaries(self) -> bool:
+        """Train zstd dictionaries for job descriptions and resumes, then exit."""
+        from output_sinks import LocalOutputSink
+        
+        store = self.create_artifact_store()
+        try:
+            trained = [
+                store.train_dictionary(kind)
+                for kind in (LocalOutputSink.JOB_DESCRIPTIONS_DIR, LocalOutputSink.RESUMES_DIR)
+            ]
+        finally:
+            store.close()
+        return any(dict_id is not None for dict_id in trained)
+    
+    def create_job_queue(self, agent):
+        """Create the job queue for the configured execution mode."""
+        if self.execution_mode == "sequential":
+            from job_queue import JobQueue
+            
+            return JobQueue(agent, max_size=self.job_queue_size, workers=self.job_workers)
+        if self.execution_mode == "pipelined":
+            from pipeline import PipelinedJobQueue, parse_pool_sizes
+            
+            return PipelinedJobQueue(
+                agent,
+                max_size=self.job_queue_size,
+                pool_sizes=parse_pool_sizes(self.pipeline_workers),
+                stage_queue_size=self.pipeline_queue_size
+            )
+        raise ValueError(f"Unknown EXECUTION_MODE: {self.execution_mode}")
+    
+    def create_agent(self):
+        """Create the TuneIt agent from the environment configuration."""
+        # Imported here so health checks don't pay for the agent's dependencies
+        from agent import TuneItAgent, parse_resume_profiles
+        from profiling import JobProfiler
+        
+        logger.info("Initializing TuneIt agent...")
+        mcp_options = dict(self.mcp_options)
+        if self.token_budget_per_minute > 0:
+            from token_budget import TokenBudget
+            
+            mcp_options["token_budget"] = TokenBudget(
+                self.token_budget_per_minute,
+                self.token_budget_burst or None
+            )
+        history = None
+        if self.job_history_db:
+            from job_history import JobHistory
+            
+            history = JobHistory(self.job_history_db)
+        return TuneItAgent(
+            self.mcp_url,
+            parse_resume_profiles(self.resume_profiles),
+            mcp_options,
+            self.create_output_sink(),
+            JobProfiler(
+                self.profile_directory,
+                sample_rate=self.profile_sample_rate,
+                trace_memory=self.profile_memory,
+                enabled=self.profile
+            ),
+            max_input_bytes=self.max_input_bytes,
+            format_chunk_chars=self.format_chunk_chars,
+            format_concurrency=self.format_concurrency,
+            history=history
+        )
+    
     def start(self):
         """Start the background service."""
         logger.info("Starting TuneIt AI Agent background service...")
         
+        from file_watcher import FileWatcher
+        
         try:
             # Initialize the agent
-            logger.info("Initializing TuneIt agent...")
-            self.agent = TuneItAgent(self.mcp_url)
+            self.agent = self.create_agent()
+            
+            # Initialize the job queue shared by all ingestion sources
+            self.job_queue = self.create_job_queue(self.agent)
+            self.job_queue.start()
             
             # Initialize the file watcher
             logger.info("Initializing file watcher...")
             self.watcher = FileWatcher(
                 self.agent,
                 self.watch_directory,
-                self.allowed_extensions
+                self.allowed_extensions,
+                ProcessedFileTracker(
+                    max_entries=self.processed_cache_size,
+                    ttl_seconds=self.processed_cache_ttl,
+                    bloom_capacity=self.processed_bloom_capacity,
+                ),
+                self.job_queue
             )
             
+            # Optionally accept job descriptions over HTTP
+            if self.ingest_port:
+                from ingest_api import IngestServer
+                
+                self.ingest_server = IngestServer(
+                    self.job_queue,
+                    self.ingest_directory,
+                    host=self.ingest_host,
+                    port=int(self.ingest_port),
+                    max_bytes=self.ingest_max_bytes
+                )
+                self.ingest_server.start()
+            
             # Setup signal handlers
             self.setup_signal_handlers()
             
@@ -101,6 +342,43 @@ class BackgroundRunner:
         finally:
             self.stop()
     
+    def retailor(self, concurrency: int | None = None) -> bool:
+        """
+        Re-tailor saved resumes whose base resume has changed, then exit.
+        
+        Args:
+            concurrency: Resumes tailored at once (default: RETAILOR_CONCURRENCY)
+            
+        Returns:
+            True if every out-of-date resume was re-tailored
+        """
+        if not self.job_history_db:
+            logger.error("Retailoring needs the job history; set JOB_HISTORY_DB")
+            return False
+        
+        from retailor import retailor
+        
+        stop_event = threading.Event()
+        
+        def request_stop(signum, frame):
+            logger.info(f"Received signal {signum}, finishing resumes in flight...")
+            stop_event.set()
+        
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+        
+        self.agent = self.create_agent()
+        try:
+            counts = retailor(
+                self.agent,
+                self.agent.history,
+                concurrency=concurrency or self.retailor_concurrency,
+                stop_event=stop_event
+            )
+        finally:
+            self.agent.close()
+        return counts["failed"] == 0 and not stop_event.is_set()
+    
     def stop(self):
         """Stop the background service."""
         if not self.running:
@@ -109,6 +387,12 @@ class BackgroundRunner:
         logger.info("Stopping TuneIt AI Agent background service...")
         self.running = False
         
+        if self.ingest_server:
+            try:
+                self.ingest_server.stop()
+            except Exception as e:
+                logger.error(f"Error stopping ingest API: {e}")
+        
         if self.watcher:
             try:
                 self.watcher.stop()
@@ -116,6 +400,12 @@ class BackgroundRunner:
             except Exception as e:
                 logger.error(f"Error stopping file watcher: {e}")
         
+        if self.job_queue:
+            try:
+                self.job_queue.stop()
+            except Exception as e:
+                logger.error(f"Error stopping job queue: {e}")
+        
         if self.agent:
             try:
                 self.agent.close()
@@ -126,14 +416,69 @@ class BackgroundRunner:
         logger.info("Background service stopped")
 
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="TuneIt AI Agent - Background Runner")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["run", "retailor", "export", "train-dictionary"],
+        default="run",
+        help="run: watch for new job descriptions (default); "
+             "retailor: re-tailor past jobs whose base resume has changed, then exit; "
+             "export: write the artifact archive out as plain files; "
+             "train-dictionary: train zstd dictionaries on archived outputs"
+    )
+    parser.add_argument(
+        "--healthcheck",
+        action="store_true",
+        help="Check the MCP endpoint and watch directory, then exit (0 = healthy)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile a sample of jobs (see PROFILE_SAMPLE_RATE); toggle at runtime with SIGUSR1"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Resumes tailored at once in retailor mode (default: RETAILOR_CONCURRENCY)"
+    )
+    parser.add_argument(
+        "--dest",
+        default="./export",
+        help="Destination directory for export (default: ./export)"
+    )
+    parser.add_argument(
+        "--all-versions",
+        action="store_true",
+        help="Export every version of each output, not just the latest"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point."""
+    args = parse_args()
+    configure_logging(log_to_file=not args.healthcheck)
+    
+    if args.healthcheck:
+        runner = BackgroundRunner()
+        sys.exit(0 if runner.healthcheck() else 1)
+    
     logger.info("=" * 60)
     logger.info("TuneIt AI Agent - Background Runner")
     logger.info("=" * 60)
     
     # Create and start the runner
-    runner = BackgroundRunner()
+    runner = BackgroundRunner(profile=args.profile)
+    if args.command == "retailor":
+        sys.exit(0 if runner.retailor(args.concurrency) else 1)
+    if args.command == "export":
+        sys.exit(0 if runner.export_archive(args.dest, args.all_versions) else 1)
+    if args.command == "train-dictionary":
+        sys.exit(0 if runner.train_dictionaries() else 1)
     runner.start()
 
 
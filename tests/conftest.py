@@ -0,0 +1,97 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class StubMCPClient:
+    """Stands in for MCPClient, answering format and tailor calls locally."""
+
+    def __init__(self, fail_for=()):
+        # Tailoring fails for base resumes containing any of these strings
+        self.fail_for = tuple(fail_for)
+        self.calls = {"format_to_markdown": 0, "tailor_resume": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, tool_name):
+        with self._lock:
+            self.calls[tool_name] += 1
+
+    def format_job_description(self, job_description, session=None):
+        self._count("format_to_markdown")
+        return f"# Formatted\n\n{job_description}"
+
+    def generate_tailored_resume(self, job_description, base_resume=None, session=None):
+        self._count("tailor_resume")
+        if any(marker in base_resume for marker in self.fail_for):
+            raise RuntimeError("tailoring failed")
+        return f"{base_resume.strip()} tailored to {job_description.splitlines()[-1]}"
+
+    def endpoint_stats(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class RecordingSink:
+    """Output sink that keeps saved outputs in memory."""
+
+    def __init__(self):
+        self.job_descriptions = {}
+        self.resumes = {}
+        self._lock = threading.Lock()
+
+    def save_job_description(self, job_description, job_title):
+        with self._lock:
+            self.job_descriptions[job_title] = job_description
+        return job_title
+
+    def save_tailored_resume(self, resume_content, job_title):
+        with self._lock:
+            self.resumes[job_title] = resume_content
+        return job_title
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_agent(tmp_path):
+    """Build TuneItAgents wired to a StubMCPClient and a RecordingSink."""
+    from agent import ResumeProfile, TuneItAgent
+
+    agents = []
+
+    def make(profiles=("alice", "bob"), fail_for=(), history=None, **options):
+        resume_profiles = []
+        for name in profiles:
+            path = tmp_path / f"{name}.md"
+            if not path.exists():
+                path.write_text(f"Resume of {name}\n", encoding="utf-8")
+            resume_profiles.append(ResumeProfile(name, str(path)))
+        agent = TuneItAgent("http://127.0.0.1:9", profiles=tuple(resume_profiles),
+                            output_sink=RecordingSink(), history=history, **options)
+        agent.mcp_client.close()
+        agent.mcp_client = StubMCPClient(fail_for)
+        agents.append(agent)
+        return agent
+
+    yield make
+    for agent in agents:
+        agent.close()
+
+
+@pytest.fixture
+def job_file(tmp_path):
+    """Write a job description file and return its path."""
+    def write(name, content=None):
+        path = tmp_path / "jobs" / f"{name}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content or f"Job description for {name}\n", encoding="utf-8")
+        return str(path)
+    return write
@@ -0,0 +1,43 @@
+def test_profiles_fan_out_from_one_format_to_one_save(make_agent, job_file):
+    agent = make_agent(profiles=("alice", "bob", "carol"))
+    state = agent.process_job_description(job_file("ml_engineer"))
+
+    assert state['status'] == 'completed'
+    assert agent.mcp_client.calls == {"format_to_markdown": 1, "tailor_resume": 3}
+    assert list(agent.output_sink.job_descriptions) == ["ml_engineer"]
+    assert sorted(state['tailored_resumes']) == ["alice", "bob", "carol"]
+    assert sorted(agent.output_sink.resumes) == [
+        "alice_ml_engineer", "bob_ml_engineer", "carol_ml_engineer"
+    ]
+    assert agent.output_sink.resumes["bob_ml_engineer"].startswith("Resume of bob")
+    assert sorted(state['base_resume_hashes']) == ["alice", "bob", "carol"]
+
+
+def test_failed_profile_still_saves_the_others(make_agent, job_file):
+    agent = make_agent(profiles=("alice", "bob", "carol"), fail_for=("Resume of bob",))
+    state = agent.process_job_description(job_file("ml_engineer"))
+
+    assert state['status'] == 'error'
+    assert state['profile_errors'] == {"bob": "tailoring failed"}
+    assert state['error'] == "Tailoring failed for profiles: bob: tailoring failed"
+    assert list(agent.output_sink.job_descriptions) == ["ml_engineer"]
+    assert sorted(agent.output_sink.resumes) == ["alice_ml_engineer", "carol_ml_engineer"]
+
+
+def test_unreadable_job_description_stops_before_formatting(make_agent):
+    agent = make_agent()
+    state = agent.process_job_description("/nonexistent/job.txt")
+
+    assert state['status'] == 'error'
+    assert agent.mcp_client.calls == {"format_to_markdown": 0, "tailor_resume": 0}
+    assert not agent.output_sink.job_descriptions
+
+
+
+def test_truncated_job_description_completes_with_a_warning(make_agent, job_file):
+    agent = make_agent(max_input_bytes=16)
+    state = agent.process_job_description(job_file("long", "x" * 100))
+
+    assert state['status'] == 'completed'
+    assert state['warning'].startswith("Job description truncated to 16 bytes")
+    assert state['job_description_content'] == "x" * 16
@@ -0,0 +1,92 @@
+import pytest
+
+import artifact_store
+from artifact_store import ArtifactStore
+
+
+@pytest.fixture(params=["zstd", "gzip"])
+def store(request, tmp_path):
+    store = ArtifactStore(str(tmp_path / "archive"), compression=request.param, fsync=False)
+    yield store
+    store.close()
+
+
+def test_identical_content_is_stored_once(store):
+    first = store.put("resumes", "job_a", "same content")
+    second = store.put("resumes", "job_b", "same content")
+    assert first == second
+
+    stats = store.stats()
+    assert stats["artifacts"] == 2
+    assert stats["blobs"] == 1
+
+
+def test_get_returns_latest_or_version_at_time(store):
+    store.put("resumes", "job", "v1")
+    (created_at, _), = store.versions("resumes", "job")
+    store.put("resumes", "job", "v2")
+
+    assert store.get("resumes", "job") == "v2"
+    assert store.get("resumes", "job", at=created_at) == "v1"
+    assert store.get("resumes", "job", at=created_at - 1) is None
+    assert store.get("resumes", "missing") is None
+
+
+def test_export_round_trip(store, tmp_path):
+    contents = {f"job_{i}": f"# Resume {i}\n\nÜnïcode body {i}\n" for i in range(5)}
+    for name, content in contents.items():
+        store.put("resumes", name, "old version")
+        store.put("resumes", name, content)
+
+    destination = tmp_path / "export"
+    assert store.export(str(destination)) == 5
+    for name, content in contents.items():
+        assert (destination / "resumes" / f"{name}.md").read_text(encoding="utf-8") == content
+
+    assert store.export(str(tmp_path / "all"), all_versions=True) == 10
+
+
+def test_trained_dictionary_still_reads_old_blobs(tmp_path):
+    store = ArtifactStore(str(tmp_path / "archive"), compression="zstd", fsync=False)
+    try:
+        for i in range(50):
+            store.put("resumes", f"job_{i}", f"# Resume\n\nExperience with Python {i}\n" * 20)
+        dict_id = store.train_dictionary("resumes", dict_size=4096)
+        assert dict_id
+        store.put("resumes", "new", "# Resume\n\nExperience with Python new\n" * 20)
+
+        assert store.get("resumes", "job_0") == "# Resume\n\nExperience with Python 0\n" * 20
+        assert store.get("resumes", "new") == "# Resume\n\nExperience with Python new\n" * 20
+    finally:
+        store.close()
+
+
+def test_same_timestamp_puts_resolve_to_the_last_one(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_store.time, "time", lambda: 1760000000.0)
+    for version in ("v1", "v2", "v3"):
+        store.put("resumes", "job", version)
+
+    assert store.get("resumes", "job") == "v3"
+    store.export(str(tmp_path / "export"))
+    assert (tmp_path / "export" / "resumes" / "job.md").read_text() == "v3"
+
+
+def test_dictionary_trained_elsewhere_is_used_without_restart(tmp_path):
+    service = ArtifactStore(str(tmp_path / "archive"), compression="zstd", fsync=False)
+    trainer = ArtifactStore(str(tmp_path / "archive"), compression="zstd", fsync=False)
+    try:
+        for i in range(50):
+            service.put("resumes", f"job_{i}", f"# Resume\n\nExperience with Python {i}\n" * 20)
+        dict_id = trainer.train_dictionary("resumes", dict_size=4096)
+
+        service.put("resumes", "new", "# Resume\n\nExperience with Python new\n" * 20)
+        with service._lock:
+            used, = service._conn.execute(
+                "SELECT b.dict_id FROM artifacts a JOIN blobs b ON b.digest = a.digest "
+                "WHERE a.name = 'new'"
+            ).fetchone()
+        assert used == dict_id
+        assert trainer.get("resumes", "new") == "# Resume\n\nExperience with Python new\n" * 20
+    finally:
+        trainer.close()
+        service.close()
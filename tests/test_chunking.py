@@ -0,0 +1,42 @@
+import pytest
+
+from chunking import chunk_text, read_text_capped
+
+JOB = "".join(
+    f"## Posting {i}\n\nResponsibilities:\n" + "".join(
+        f"- Duty {i}.{j} with enough words to take up some space\n" for j in range(8)
+    ) + "\n" + f"Paragraph {i}. " * 30 + "\n\n"
+    for i in range(20)
+)
+
+
+@pytest.mark.parametrize("max_chars", [200, 500, 2000])
+def test_chunks_are_bounded_ordered_and_lossless(max_chars):
+    chunks = chunk_text(JOB, max_chars)
+    assert len(chunks) > 1
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+    # Only whitespace at chunk boundaries may change
+    assert "".join("".join(chunks).split()) == "".join(JOB.split())
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("short", 100) == ["short"]
+
+
+def test_chunks_prefer_section_boundaries():
+    chunks = chunk_text(JOB, 1200)
+    assert all(chunk.startswith(("## Posting", "Responsibilities:")) for chunk in chunks)
+
+
+def test_read_text_capped_normalizes_newlines(tmp_path):
+    path = tmp_path / "job.txt"
+    path.write_bytes(b"one\r\ntwo\rthree\n")
+    assert read_text_capped(str(path), 1024) == ("one\ntwo\nthree\n", False)
+
+
+def test_read_text_capped_truncates_without_splitting_characters(tmp_path):
+    path = tmp_path / "job.txt"
+    path.write_bytes("é".encode("utf-8") * 10)
+    text, truncated = read_text_capped(str(path), 5)
+    assert truncated
+    assert text == "éé"
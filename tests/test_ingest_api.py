@@ -0,0 +1,119 @@
+import asyncio
+import queue
+
+import pytest
+from starlette.testclient import TestClient
+
+from ingest_api import _done_future, _wait_done, create_app
+from job_queue import JobRecord
+
+
+class FakeQueue:
+    """Stands in for JobQueue, recording submissions."""
+
+    def __init__(self, full=False, reject=False):
+        self._full = full
+        self._reject = reject
+        self.records = {}
+
+    def full(self):
+        return self._full
+
+    def retry_after(self):
+        return 7
+
+    def submit(self, file_path, source="file", block=True, on_done=None):
+        if self._reject:
+            raise queue.Full
+        record = JobRecord(f"job{len(self.records)}", file_path, source)
+        if on_done is not None:
+            record.add_done_callback(on_done)
+        self.records[record.job_id] = record
+        return record
+
+    def get(self, job_id):
+        return self.records.get(job_id)
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return tmp_path / "spool"
+
+
+def test_full_queue_returns_429_with_retry_after(spool):
+    client = TestClient(create_app(FakeQueue(full=True), str(spool)))
+    response = client.post("/jobs", content=b"A job")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+
+
+def test_rejected_submission_removes_spool_file(spool):
+    client = TestClient(create_app(FakeQueue(reject=True), str(spool)))
+    response = client.post("/jobs", content=b"A job")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert not list(spool.iterdir())
+
+
+def test_submit_spools_and_cleans_up_when_done(spool):
+    job_queue = FakeQueue()
+    client = TestClient(create_app(job_queue, str(spool)))
+    response = client.post("/jobs", json={"name": "ML Engineer", "content": "A job"})
+    assert response.status_code == 202
+    record = job_queue.get(response.json()["job_id"])
+    assert record.file_path.startswith(str(spool / "ML_Engineer_"))
+    with open(record.file_path, encoding="utf-8") as f:
+        assert f.read() == "A job"
+
+    record._finish("completed", None, "Job description truncated")
+    assert not list(spool.iterdir())
+    status = client.get(f"/jobs/{record.job_id}").json()
+    assert status["status"] == "completed"
+    assert status["warning"] == "Job description truncated"
+
+
+@pytest.mark.parametrize("payload", [
+    {"content": 42},
+    {"content": "A job", "name": ["list"]},
+    {"name": "no content"},
+    {"content": "   "},
+])
+def test_invalid_submissions_return_400(spool, payload):
+    client = TestClient(create_app(FakeQueue(), str(spool)))
+    assert client.post("/jobs", json=payload).status_code == 400
+
+
+def test_body_over_limit_returns_413(spool):
+    client = TestClient(create_app(FakeQueue(), str(spool), max_bytes=10))
+    assert client.post("/jobs", content=b"x" * 11).status_code == 413
+
+
+def test_unknown_job_returns_404(spool):
+    client = TestClient(create_app(FakeQueue(), str(spool)))
+    assert client.get("/jobs/nope").status_code == 404
+
+
+def test_repeated_waits_register_one_done_callback():
+    record = JobRecord("job", "job.txt", "http")
+
+    async def wait_a_few_times():
+        done = _done_future(record)
+        results = [await _wait_done(done, 0.01) for _ in range(5)]
+        callbacks = len(record._callbacks)
+        record._finish("completed", None)
+        results.append(await _wait_done(done, 1))
+        return results, callbacks
+
+    assert asyncio.run(wait_a_few_times()) == ([False] * 5 + [True], 1)
+
+
+def test_events_stream_ends_with_done_event(spool):
+    job_queue = FakeQueue()
+    client = TestClient(create_app(job_queue, str(spool)))
+    job_id = client.post("/jobs", content=b"A job").json()["job_id"]
+    job_queue.get(job_id)._finish("completed", None)
+
+    body = client.get(f"/jobs/{job_id}/events").text
+    assert body.startswith("event: status\n")
+    assert "event: done\n" in body
+    assert '"status": "completed"' in body.split("event: done")[1]
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+import load_balancer
+from load_balancer import EndpointPool, parse_endpoints
+
+URLS = ["http://mcp-1:8000", "http://mcp-2:8000"]
+
+
+def test_parse_endpoints():
+    assert parse_endpoints(" http://a:1/ ,http://b:2,") == ["http://a:1", "http://b:2"]
+    with pytest.raises(ValueError):
+        parse_endpoints(" , ")
+
+
+def test_least_outstanding_spreads_calls():
+    pool = EndpointPool(URLS, health_interval=0)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is not second
+
+
+def test_consecutive_failures_eject_until_timeout():
+    pool = EndpointPool(URLS, eject_failures=2, eject_seconds=0.2, health_interval=0)
+    bad = pool.endpoints[0]
+    for _ in range(2):
+        pool.release(pool.acquire(exclude={URLS[1]}), 0.01, ok=False)
+
+    assert all(pool.acquire() is not bad for _ in range(10))
+    assert not pool.stats()[0]["healthy"]
+
+    time.sleep(0.25)
+    assert pool.stats()[0]["healthy"]
+
+
+def test_health_checker_ejects_and_readmits_after_eject_seconds(monkeypatch):
+    up = {URLS[0]: False, URLS[1]: True}
+    monkeypatch.setattr(load_balancer, "probe_endpoint", lambda url, timeout: up[url])
+
+    pool = EndpointPool(URLS, eject_seconds=0.3, health_interval=0.05)
+    try:
+        deadline = time.monotonic() + 2
+        while pool.stats()[0]["healthy"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not pool.stats()[0]["healthy"]
+
+        up[URLS[0]] = True
+        answering_since = time.monotonic()
+        deadline = answering_since + 2
+        while not pool.stats()[0]["healthy"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()[0]["healthy"]
+        # Answering probes again doesn't cut the ejection short
+        assert time.monotonic() - answering_since >= 0.2
+        assert pool.stats()[0]["ejections"] == 1
+    finally:
+        pool.close()
+
+
+def test_sticky_sessions_follow_the_first_endpoint():
+    pool = EndpointPool(URLS, health_interval=0)
+    first = pool.acquire(session="job-1")
+    # Load the session's endpoint so least-outstanding would pick the other one
+    pool.acquire(exclude={URLS[1] if first.url == URLS[0] else URLS[0]})
+    assert pool.acquire(session="job-1") is first
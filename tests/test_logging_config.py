@@ -0,0 +1,113 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+import logging_config
+from logging_config import (
+    JobIdFilter, JsonFormatter, StructuredQueueHandler, job_context, truncate_payload,
+)
+
+
+def make_record(msg="hello %s", args=("world",), exc_info=None, **extra):
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, msg, args, exc_info)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_truncate_payload():
+    assert truncate_payload("short", limit=10) == "short"
+    text = "x" * 50
+    truncated = truncate_payload(text, limit=10)
+    assert truncated.startswith("x" * 10 + "... [truncated 50 chars, sha256=")
+    assert truncated == truncate_payload(text, limit=10)
+    assert truncate_payload({"a": 1}, limit=100) == "{'a': 1}"
+
+
+def test_truncate_payload_uses_the_configured_limit(monkeypatch):
+    monkeypatch.setattr(logging_config, "payload_limit", 5)
+    assert truncate_payload("123456").startswith("12345... [truncated 6 chars")
+
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(
+        make_record(job_id="abc", stage="format", duration_ms=1.5)
+    ))
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert (entry["job_id"], entry["stage"], entry["duration_ms"]) == ("abc", "format", 1.5)
+    assert "args" not in entry and "msg" not in entry
+
+
+def test_prepare_keeps_extra_fields_and_formats_exceptions():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record(exc_info=sys.exc_info(), job_id="abc")
+
+    prepared = StructuredQueueHandler(queue.SimpleQueue()).prepare(record)
+    assert (prepared.msg, prepared.args, prepared.exc_info) == ("hello world", None, None)
+    assert "ValueError: boom" in prepared.exc_text
+    assert prepared.job_id == "abc"
+    # The original record is left untouched for other handlers
+    assert record.args == ("world",)
+
+    entry = json.loads(JsonFormatter().format(prepared))
+    assert "ValueError: boom" in entry["exception"]
+    assert entry["job_id"] == "abc"
+
+
+def test_job_id_filter_tags_records_inside_job_context():
+    job_filter = JobIdFilter()
+    outside = make_record()
+    job_filter.filter(outside)
+    assert not hasattr(outside, "job_id")
+
+    with job_context("job-1"):
+        inside = make_record()
+        job_filter.filter(inside)
+        explicit = make_record(job_id="job-2")
+        job_filter.filter(explicit)
+        with job_context("nested"):
+            nested = make_record()
+            job_filter.filter(nested)
+        after_nested = make_record()
+        job_filter.filter(after_nested)
+
+    assert inside.job_id == "job-1"
+    assert explicit.job_id == "job-2"
+    assert nested.job_id == "nested"
+    assert after_nested.job_id == "job-1"
+
+
+def test_queued_records_reach_the_writer_as_json():
+    log_queue = queue.SimpleQueue()
+    handler = StructuredQueueHandler(log_queue)
+    handler.addFilter(JobIdFilter())
+    logger = logging.getLogger("tests.queued")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+
+    lines = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            lines.append(self.format(record))
+
+    capture = Capture()
+    capture.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(log_queue, capture)
+    listener.start()
+    try:
+        with job_context("job-1"):
+            logger.info("Stage %s done", "format", extra={"duration_ms": 2.0})
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+
+    entry, = [json.loads(line) for line in lines]
+    assert entry["message"] == "Stage format done"
+    assert (entry["job_id"], entry["duration_ms"]) == ("job-1", 2.0)
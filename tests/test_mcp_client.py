@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from agent import MCPClient
+from token_budget import TokenBudget
+
+
+class FakeFastMCPClient:
+    """Async context manager mimicking fastmcp.Client for one endpoint."""
+
+    def __init__(self, url, behaviour):
+        self.url = url
+        self.behaviour = behaviour
+
+    async def __aenter__(self):
+        if self.behaviour == "refuse":
+            raise httpx.ConnectError("connection refused")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def call_tool(self, tool_name, arguments):
+        if self.behaviour == "timeout":
+            raise httpx.ReadTimeout("read timed out")
+        text = "y" * 400
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def make_client(behaviours, **options):
+    client = MCPClient("http://mcp-1:8000,http://mcp-2:8000", health_interval=0,
+                       sticky_sessions=False, **options)
+    sent = []
+
+    def client_for(url):
+        sent.append(url)
+        return FakeFastMCPClient(url, behaviours[url])
+
+    client.client_for = client_for
+    return client, sent
+
+
+def test_unsent_call_is_retried_on_another_endpoint_and_charged_once():
+    budget = TokenBudget(600000, output_ratios={"format_to_markdown": 1.0})
+    client, sent = make_client(
+        {"http://mcp-1:8000": "refuse", "http://mcp-2:8000": "ok"}, token_budget=budget
+    )
+    # Make the refusing endpoint the first choice
+    client.pool.endpoints[1].outstanding = 1
+    try:
+        assert client.format_job_description("x" * 400) == "y" * 400
+    finally:
+        client.close()
+
+    assert sent == ["http://mcp-1:8000", "http://mcp-2:8000"]
+    stats = budget.stats()
+    assert stats["calls"] == 1
+    assert stats["actual_tokens"] == 200
+
+
+def test_call_that_may_have_been_sent_is_not_retried():
+    client, sent = make_client({"http://mcp-1:8000": "timeout", "http://mcp-2:8000": "timeout"})
+    try:
+        with pytest.raises(httpx.ReadTimeout):
+            client.format_job_description("x")
+    finally:
+        client.close()
+    assert len(sent) == 1
@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from output_sinks import LocalOutputSink, _GroupSync
+
+
+@pytest.mark.parametrize("fsync", [True, False])
+def test_concurrent_writes_are_all_committed(tmp_path, fsync):
+    sink = LocalOutputSink(str(tmp_path), fsync=fsync, fsync_window_ms=20)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(
+            lambda i: sink.save_tailored_resume(f"resume {i}", f"job_{i}"), range(32)
+        ))
+
+    for i, path in enumerate(paths):
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == f"resume {i}"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_lone_commit_does_not_wait_for_the_window(tmp_path):
+    sink = LocalOutputSink(str(tmp_path), fsync_window_ms=1000)
+    start = time.monotonic()
+    sink.save_job_description("content", "job")
+    assert time.monotonic() - start < 0.5
+
+
+def test_commit_waits_at_most_one_window_for_a_stalled_writer(tmp_path):
+    group = _GroupSync(window_ms=100)
+    group.begin()  # a writer that never commits
+    group.begin()
+    tmp = tmp_path / "out.tmp"
+    tmp.write_text("data")
+
+    start = time.monotonic()
+    group.commit(str(tmp), str(tmp_path / "out.md"))
+    assert 0.05 <= time.monotonic() - start < 0.5
+    assert (tmp_path / "out.md").read_text() == "data"
+
+
+def test_abort_releases_a_waiting_commit(tmp_path):
+    group = _GroupSync(window_ms=5000)
+    group.begin()
+    group.begin()
+    tmp = tmp_path / "out.tmp"
+    tmp.write_text("data")
+
+    threading.Timer(0.05, group.abort).start()
+    start = time.monotonic()
+    group.commit(str(tmp), str(tmp_path / "out.md"))
+    assert time.monotonic() - start < 1
+
+
+def test_failed_write_removes_temp_file(tmp_path):
+    sink = LocalOutputSink(str(tmp_path), fsync_window_ms=1000)
+    with pytest.raises(TypeError):
+        sink.save_tailored_resume(None, "job")
+    assert not list(tmp_path.rglob("*.tmp"))
+    # The aborted write must not hold up the next commit
+    start = time.monotonic()
+    sink.save_tailored_resume("ok", "job")
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,126 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue
+from pipeline import PipelinedJobQueue, Stage, parse_pool_sizes
+
+
+def wait_all(records, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not all(record.done for record in records) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert all(record.done for record in records)
+
+
+def run_jobs(agent, paths, **options):
+    jobs = PipelinedJobQueue(agent, **options)
+    jobs.start()
+    try:
+        records = [jobs.submit(path) for path in paths]
+        wait_all(records)
+    finally:
+        jobs.stop()
+    return records
+
+
+def test_parse_pool_sizes():
+    assert parse_pool_sizes("format=2, generate=3")["generate"] == 3
+    assert parse_pool_sizes(None)["read"] == 1
+    with pytest.raises(ValueError):
+        parse_pool_sizes("bogus=2")
+
+
+def test_profiles_fan_out_and_fan_in_to_one_save(make_agent, job_file):
+    agent = make_agent()
+    records = run_jobs(agent, [job_file(f"job_{i}") for i in range(5)],
+                       pool_sizes={"generate": 4})
+
+    assert [record.status for record in records] == ["completed"] * 5
+    assert agent.mcp_client.calls == {"format_to_markdown": 5, "tailor_resume": 10}
+    assert len(agent.output_sink.job_descriptions) == 5
+    assert sorted(agent.output_sink.resumes) == sorted(
+        f"{profile}_job_{i}" for profile in ("alice", "bob") for i in range(5)
+    )
+
+
+def test_failed_profile_saves_the_others_and_fails_the_job(make_agent, job_file):
+    agent = make_agent(fail_for=("Resume of bob",))
+    record, = run_jobs(agent, [job_file("job")])
+
+    assert record.status == "error"
+    assert record.error == "Tailoring failed for profiles: bob: tailoring failed"
+    assert list(agent.output_sink.resumes) == ["alice_job"]
+
+
+def test_stage_error_fails_only_that_job(make_agent, job_file):
+    agent = make_agent()
+    bad, good = run_jobs(agent, ["/nonexistent/bad.txt", job_file("good")])
+
+    assert bad.status == "error"
+    assert "No such file" in bad.error
+    assert good.status == "completed"
+
+
+def test_handler_crash_finishes_the_job_and_keeps_the_worker(make_agent, job_file):
+    class BrokenProfiler:
+        def start_job(self, job_id, name):
+            return None
+
+        def get(self, job_id):
+            return None
+
+        def finish_job(self, job_id):
+            raise RuntimeError("profiler broke")
+
+    agent = make_agent(profiler=BrokenProfiler())
+    records = run_jobs(agent, [job_file(f"job_{i}") for i in range(3)],
+                       pool_sizes={"save": 1})
+
+    assert all((r.status, r.error) == ("error", "profiler broke") for r in records)
+
+
+def test_stage_reports_errors_and_keeps_working():
+    handled, failed = [], []
+
+    def handler(item):
+        if item == "bad":
+            raise ValueError(item)
+        handled.append(item)
+
+    stage = Stage("test", handler, 1, queue.Queue(),
+                  on_error=lambda item, e: failed.append((item, str(e))))
+    stage.start()
+    for item in ("a", "bad", "b"):
+        stage.queue.put(item)
+    stage.stop()
+
+    assert handled == ["a", "b"]
+    assert failed == [("bad", "bad")]
+    assert stage.stats()["items"] == 3
+
+
+def test_stop_cancels_jobs_not_yet_started():
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowAgent:
+        def process_job_description(self, file_path, job_id=None):
+            started.set()
+            release.wait()
+            return {"status": "completed", "error": None}
+
+    jobs = JobQueue(SlowAgent(), workers=1)
+    jobs.start()
+    running = jobs.submit("running.txt")
+    started.wait(5)
+    queued = [jobs.submit(f"queued_{i}.txt") for i in range(3)]
+
+    threading.Timer(0.1, release.set).start()
+    jobs.stop()
+
+    assert running.status == "completed"
+    assert all(record.status == "error" for record in queued)
+    assert all(record.error == "Service stopped before the job started" for record in queued)
@@ -0,0 +1,40 @@
+import os
+
+from processed_tracker import BloomFilter, ProcessedFileTracker, file_digest
+
+
+def test_bloom_false_positive_rate_at_capacity():
+    bloom = BloomFilter(10000, error_rate=0.01)
+    for _ in range(10000):
+        bloom.add(os.urandom(16))
+    false_positives = sum(os.urandom(16) in bloom for _ in range(10000))
+    assert false_positives / 10000 < 0.02
+
+
+def test_tracker_accepts_new_digests_past_bloom_capacity():
+    tracker = ProcessedFileTracker(max_entries=100, bloom_capacity=1000, bloom_error_rate=0.001)
+    keys = [os.urandom(16) for _ in range(20000)]
+    accepted = sum(tracker.add(key) for key in keys)
+    # Rotation keeps the false positive rate bounded instead of saturating
+    assert accepted > 19900
+    assert len(tracker) == 100
+    # The last generations are still remembered
+    assert keys[-500] in tracker
+    assert not tracker.add(keys[-500])
+
+
+def test_discard_allows_reprocessing():
+    tracker = ProcessedFileTracker(max_entries=10)
+    key = os.urandom(16)
+    assert tracker.add(key)
+    assert not tracker.add(key)
+    tracker.discard(key)
+    assert tracker.add(key)
+
+
+def test_digest_changes_with_content(tmp_path):
+    path = tmp_path / "job.txt"
+    path.write_text("first")
+    first = file_digest(str(path))
+    path.write_text("second")
+    assert file_digest(str(path)) != first
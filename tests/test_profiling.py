@@ -0,0 +1,74 @@
+import pstats
+import threading
+
+import pytest
+
+from profiling import JobProfiler, ProfiledJob
+
+
+def busy(n=20000):
+    return sum(i * i for i in range(n))
+
+
+def test_disabled_profiler_samples_nothing(tmp_path):
+    profiler = JobProfiler(str(tmp_path), sample_rate=1.0, enabled=False)
+    assert profiler.start_job("job", "tag") is None
+    assert profiler.get("job") is None
+
+
+@pytest.mark.parametrize("rate, sampled", [(0.0, 0), (1.0, 20)])
+def test_sample_rate(tmp_path, rate, sampled):
+    profiler = JobProfiler(str(tmp_path), sample_rate=rate, trace_memory=False, enabled=True)
+    jobs = [profiler.start_job(f"job{i}", "tag") for i in range(20)]
+    assert sum(job is not None for job in jobs) == sampled
+
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        JobProfiler(sample_rate=1.5)
+
+
+def test_nested_runs_in_one_thread_share_the_outer_profile():
+    job = ProfiledJob("job", "tag")
+    assert job.run(lambda: job.run(busy) + 1) == busy() + 1
+    assert len(job.profiles) == 1
+    assert job.unprofiled_stages == 0
+
+
+def test_concurrent_runs_never_fail():
+    job = ProfiledJob("job", "tag")
+    barrier = threading.Barrier(2)
+    results = []
+
+    def stage():
+        barrier.wait()
+        results.append(job.run(busy))
+
+    threads = [threading.Thread(target=stage) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [busy()] * 2
+    # Python 3.12+ allows one active profiler; the other stage runs unprofiled
+    assert len(job.profiles) + job.unprofiled_stages == 2
+
+
+def test_finish_job_writes_profile_and_memory_report(tmp_path):
+    profiler = JobProfiler(str(tmp_path), sample_rate=1.0, enabled=True)
+    job = profiler.start_job("abc123", "ml_engineer")
+    job.run(lambda: [bytearray(1024) for _ in range(100)] and busy())
+    profiler.finish_job("abc123")
+
+    stats = pstats.Stats(str(tmp_path / "ml_engineer_abc123.prof"))
+    assert any(func[2] == "busy" for func in stats.stats)
+    memory = (tmp_path / "ml_engineer_abc123.memory.txt").read_text(encoding="utf-8")
+    assert memory.startswith("Peak traced memory:")
+    assert profiler.get("abc123") is None
+
+
+def test_toggle(tmp_path):
+    profiler = JobProfiler(str(tmp_path))
+    assert profiler.toggle() is True
+    assert profiler.toggle() is False
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from job_history import JobHistory
+from retailor import retailor
+
+
+@pytest.fixture
+def history_agent(make_agent, job_file, tmp_path):
+    """An agent that has processed three jobs, recording them in its history."""
+    agent = make_agent(history=JobHistory(str(tmp_path / "history.db")))
+    for i in range(3):
+        assert agent.process_job_description(job_file(f"job_{i}"))['status'] == 'completed'
+    return agent
+
+
+def change_base_resume(agent, name):
+    profile, = [p for p in agent.profiles if p.name == name]
+    with open(profile.base_resume_path, "w", encoding="utf-8") as f:
+        f.write(f"Updated resume of {name}\n")
+
+
+def test_only_stale_resumes_are_retailored(history_agent):
+    agent = history_agent
+    client = agent.mcp_client
+    alice_before = {k: v for k, v in agent.output_sink.resumes.items() if k.startswith("alice_")}
+    change_base_resume(agent, "bob")
+    formats, tailors = client.calls["format_to_markdown"], client.calls["tailor_resume"]
+
+    counts = retailor(agent, agent.history)
+
+    assert (counts["stale"], counts["retailored"], counts["failed"]) == (3, 3, 0)
+    assert client.calls["format_to_markdown"] == formats
+    assert client.calls["tailor_resume"] == tailors + 3
+    for i in range(3):
+        assert agent.output_sink.resumes[f"bob_job_{i}"].startswith("Updated resume of bob")
+    assert {k: v for k, v in agent.output_sink.resumes.items()
+            if k.startswith("alice_")} == alice_before
+
+    assert retailor(agent, agent.history)["stale"] == 0
+
+
+def test_interrupted_run_resumes_where_it_stopped(history_agent):
+    agent = history_agent
+    client = agent.mcp_client
+    change_base_resume(agent, "alice")
+
+    stop_event = threading.Event()
+    save = agent.output_sink.save_tailored_resume
+
+    def save_then_stop(resume_content, job_title):
+        result = save(resume_content, job_title)
+        stop_event.set()
+        return result
+
+    agent.output_sink.save_tailored_resume = save_then_stop
+    first = retailor(agent, agent.history, concurrency=1, stop_event=stop_event)
+    assert (first["stale"], first["retailored"]) == (3, 1)
+
+    agent.output_sink.save_tailored_resume = save
+    tailors = client.calls["tailor_resume"]
+    second = retailor(agent, agent.history, concurrency=1)
+    assert (second["stale"], second["retailored"]) == (2, 2)
+    assert client.calls["tailor_resume"] == tailors + 2
+    assert all(agent.output_sink.resumes[f"alice_job_{i}"].startswith("Updated resume")
+               for i in range(3))
@@ -0,0 +1,26 @@
+import pytest
+
+import run
+
+
+@pytest.fixture
+def logging_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(run, "setup_logging", lambda **options: calls.append(options))
+    return calls
+
+
+def test_healthcheck_logs_to_console_only(monkeypatch, logging_calls):
+    monkeypatch.setattr(run.BackgroundRunner, "healthcheck", lambda self: True)
+    monkeypatch.setattr("sys.argv", ["run.py", "--healthcheck"])
+    with pytest.raises(SystemExit) as exit_info:
+        run.main()
+
+    assert exit_info.value.code == 0
+    assert logging_calls[0]["log_file"] is None
+
+
+def test_service_logs_to_the_log_file(monkeypatch, logging_calls):
+    monkeypatch.setenv("LOG_FILE", "service.log")
+    run.configure_logging()
+    assert logging_calls[0]["log_file"] == "service.log"
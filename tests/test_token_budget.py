@@ -0,0 +1,43 @@
+import time
+
+from token_budget import TokenBucket, TokenBudget, estimate_tokens
+
+
+def test_bucket_admits_burst_then_paces():
+    # 100 tokens per second, burst of 10
+    bucket = TokenBucket(6000, capacity=10)
+    assert bucket.acquire(10) == 0.0
+
+    start = time.monotonic()
+    waited = bucket.acquire(20)
+    elapsed = time.monotonic() - start
+    assert 0.15 <= waited <= 0.25
+    assert elapsed >= 0.15
+
+
+def test_bucket_admits_call_larger_than_capacity():
+    bucket = TokenBucket(60000, capacity=10)
+    assert bucket.acquire(50) < 0.1
+
+
+def test_adjust_returns_unused_tokens():
+    bucket = TokenBucket(6000, capacity=100)
+    bucket.acquire(100)
+    bucket.adjust(-100)
+    assert bucket.acquire(90) == 0.0
+
+
+def test_budget_projects_and_reconciles_usage():
+    budget = TokenBudget(600000, output_ratios={"tailor_resume": 1.0})
+    assert budget.applies_to("tailor_resume")
+    assert not budget.applies_to("save_job")
+
+    input_tokens, projected = budget.admit("tailor_resume", {"resume": "x" * 400})
+    assert input_tokens == estimate_tokens("x" * 400) == 100
+    assert projected == 200
+    assert budget.record(input_tokens, projected, "y" * 200) == 150
+
+    stats = budget.stats()
+    assert stats["calls"] == 1
+    assert stats["projected_tokens"] == 200
+    assert stats["actual_tokens"] == 150
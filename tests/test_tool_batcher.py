@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from tool_batcher import ToolBatcher
+
+
+def run_concurrently(batcher, calls):
+    """Submit calls from one thread each; return results (or exceptions) in call order."""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = batcher.submit(calls[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_lone_call_is_sent_unbatched():
+    batches = []
+    batcher = ToolBatcher("echo", send_single=lambda args: f"single:{args['n']}",
+                          send_batch=batches.append, window_ms=1)
+    try:
+        assert batcher.submit({"n": 1}) == "single:1"
+    finally:
+        batcher.close()
+    assert batches == []
+
+
+def test_concurrent_calls_are_batched_and_split_in_order():
+    sent = []
+
+    def send_batch(calls):
+        sent.append(len(calls))
+        return [f"batch:{call['n']}" for call in calls]
+
+    batcher = ToolBatcher("echo", send_single=lambda args: f"single:{args['n']}",
+                          send_batch=send_batch, window_ms=200, max_size=4)
+    try:
+        results = run_concurrently(batcher, [{"n": i} for i in range(8)])
+    finally:
+        batcher.close()
+
+    assert sorted(r.split(":")[1] for r in results) == [str(i) for i in range(8)]
+    assert all(r.endswith(f":{i}") for i, r in enumerate(results))
+    assert max(sent) == 4
+    assert batcher.stats()["items"] == 8
+
+
+def test_error_entry_fails_only_its_caller():
+    def send_batch(calls):
+        return [{"error": "bad input"} if call["n"] == 1 else f"ok:{call['n']}" for call in calls]
+
+    batcher = ToolBatcher("echo", send_single=lambda args: f"ok:{args['n']}",
+                          send_batch=send_batch, window_ms=200, max_size=3)
+    try:
+        results = run_concurrently(batcher, [{"n": i} for i in range(3)])
+    finally:
+        batcher.close()
+
+    assert results[0] == "ok:0"
+    assert isinstance(results[1], RuntimeError) and str(results[1]) == "bad input"
+    assert results[2] == "ok:2"
+
+
+def test_failed_batch_fails_every_caller():
+    def send_batch(calls):
+        return ["only one result"]
+
+    batcher = ToolBatcher("echo", send_single=lambda args: "ok",
+                          send_batch=send_batch, window_ms=200, max_size=3)
+    try:
+        results = run_concurrently(batcher, [{"n": i} for i in range(3)])
+    finally:
+        batcher.close()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_submit_after_close_raises():
+    batcher = ToolBatcher("echo", send_single=lambda args: "ok", send_batch=list)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit({})
@@ -0,0 +1,186 @@
+"""
+Token Budget - Token-aware admission control for LLM-backed MCP tools.
+
+The MCP backend enforces a tokens-per-minute quota, so bursts of jobs run
+into it and then everything slows down. TokenBudget estimates each call's
+token cost from the sizes of its inputs and admits it through a token
+bucket that refills at the quota rate, spreading bursts out so usage stays
+under budget. After each call the estimate is reconciled with the size of
+the actual response, and projected versus actual usage is reported.
+"""
+
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English prose and Markdown with common BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+# Expected output size as a fraction of input tokens, per tool
+DEFAULT_OUTPUT_RATIOS = {
+    # Formatted job description is about as long as the raw one
+    "format_to_markdown": 1.0,
+    # Input is base resume + job description; output is about one resume
+    "tailor_resume": 0.6,
+}
+
+
+def estimate_tokens(text) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = str(text)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at a fixed rate.
+
+    acquire() reserves tokens immediately and sleeps off any deficit, so
+    callers are admitted in arrival order and a call larger than the bucket
+    still goes through once the bucket has refilled.
+    """
+
+    def __init__(self, tokens_per_minute: float, capacity: float | None = None):
+        """
+        Initialize the bucket (full).
+
+        Args:
+            tokens_per_minute: Refill rate
+            capacity: Maximum burst size (default: a quarter minute's worth)
+        """
+        if tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+
+        self.rate = tokens_per_minute / 60
+        self.capacity = capacity if capacity else tokens_per_minute / 4
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float) -> float:
+        """
+        Take tokens, waiting until the bucket covers them.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            self._refill()
+            self._level -= tokens
+            deficit = -self._level
+        if deficit <= 0:
+            return 0.0
+        wait = deficit / self.rate
+        time.sleep(wait)
+        return wait
+
+    def adjust(self, tokens: float):
+        """Take extra tokens (positive) or give back unused ones (negative)."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - tokens)
+
+
+class TokenBudget:
+    """Admits LLM-backed tool calls through a token bucket and tracks usage."""
+
+    def __init__(
+        self,
+        tokens_per_minute: float,
+        burst_tokens: float | None = None,
+        output_ratios: dict[str, float] | None = None,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            tokens_per_minute: Quota enforced by the MCP backend
+            burst_tokens: Largest burst admitted at once (default: a quarter
+                of the per-minute quota)
+            output_ratios: Expected output/input token ratio per tool; only
+                tools listed here are admission controlled
+        """
+        self.bucket = TokenBucket(tokens_per_minute, burst_tokens)
+        self.tokens_per_minute = tokens_per_minute
+        self.output_ratios = output_ratios or dict(DEFAULT_OUTPUT_RATIOS)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.calls = 0
+        self.projected_tokens = 0
+        self.actual_tokens = 0
+        self.wait_seconds = 0.0
+
+    def applies_to(self, tool_name: str) -> bool:
+        return tool_name in self.output_ratios
+
+    def admit(self, tool_name: str, arguments: dict) -> tuple[int, int]:
+        """
+        Wait until the budget allows a call.
+
+        Args:
+            tool_name: Tool about to be called
+            arguments: Its arguments
+
+        Returns:
+            (input token estimate, projected total tokens), to pass to record()
+        """
+        input_tokens = sum(estimate_tokens(value) for value in arguments.values())
+        projected = math.ceil(input_tokens * (1 + self.output_ratios[tool_name]))
+        waited = self.bucket.acquire(projected)
+        if waited:
+            logger.info(f"Token budget delayed {tool_name} by {waited:.2f}s "
+                        f"({projected} projected tokens)")
+        with self._lock:
+            self.calls += 1
+            self.projected_tokens += projected
+            self.wait_seconds += waited
+        return input_tokens, projected
+
+    def record(self, input_tokens: int, projected: int, output) -> int:
+        """
+        Reconcile a finished call's projected cost with its actual output.
+
+        Args:
+            input_tokens: Input estimate returned by admit()
+            projected: Projected total returned by admit()
+            output: The tool's result
+
+        Returns:
+            Estimated actual tokens used
+        """
+        actual = input_tokens + estimate_tokens(output)
+        self.bucket.adjust(actual - projected)
+        with self._lock:
+            self.actual_tokens += actual
+        return actual
+
+    def stats(self) -> dict:
+        """Return projected versus actual token usage and admission delays."""
+        with self._lock:
+            elapsed_minutes = max((time.monotonic() - self._started) / 60, 1e-9)
+            return {
+                "calls": self.calls,
+                "projected_tokens": self.projected_tokens,
+                "actual_tokens": self.actual_tokens,
+                "actual_to_projected": (
+                    round(self.actual_tokens / self.projected_tokens, 3)
+                    if self.projected_tokens else 0.0
+                ),
+                "tokens_per_minute": round(self.actual_tokens / elapsed_minutes, 1),
+                "budget_per_minute": self.tokens_per_minute,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
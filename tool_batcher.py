@@ -0,0 +1,160 @@
+"""
+Tool Batcher - Opportunistic micro-batching of concurrent MCP tool calls.
+
+Callers of the same tool that arrive within a short window are grouped into
+a single batch request, and the results are split back to each caller. A
+lone call is sent as a regular tool call, so batching adds at most one
+window of latency and never changes results.
+
+Batch contract: send_batch returns one entry per call, in order. Each entry
+is either the result the call would have returned on its own (the tool's
+text output) or {"error": message}, which fails only that caller.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ToolBatcher:
+    """Collects concurrent calls to one tool and sends them as batches."""
+
+    def __init__(
+        self,
+        tool_name: str,
+        send_single: Callable[[dict], object],
+        send_batch: Callable[[list[dict]], list],
+        window_ms: float = 5.0,
+        max_size: int = 8,
+        max_in_flight: int = 4,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            tool_name: Name of the tool being batched
+            send_single: Sends one call and returns its result
+            send_batch: Sends a list of calls and returns results in order
+            window_ms: How long to wait for more calls after the first one
+            max_size: Maximum number of calls in one batch
+            max_in_flight: Batches sent at the same time
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.tool_name = tool_name
+        self.send_single = send_single
+        self.send_batch = send_batch
+        self.window = window_ms / 1000
+        self.max_size = max_size
+
+        self._pending: list[tuple[dict, Future]] = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        # Long-lived dispatch threads, so the next window can fill while a
+        # batch is in flight without starting a thread per batch
+        self._dispatcher = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix=f"batch-{tool_name}"
+        )
+
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, arguments: dict):
+        """
+        Queue a call and block until its result is available.
+
+        Args:
+            arguments: Arguments for the tool
+
+        Returns:
+            The tool result for this call
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Batcher for {self.tool_name} is closed")
+            self._pending.append((arguments, future))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._collect,
+                    name=f"batcher-{self.tool_name}",
+                    daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return future.result()
+
+    def _collect(self):
+        """Gather pending calls into batches and dispatch them."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending[:self.max_size]
+                del self._pending[:self.max_size]
+                self.batches += 1
+                self.items += len(batch)
+
+            self._dispatcher.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: list[tuple[dict, Future]]):
+        """Send one batch and resolve its callers' futures."""
+        logger.debug(f"Sending batch of {len(batch)} call(s) to {self.tool_name}")
+        try:
+            if len(batch) == 1:
+                results = [self.send_single(batch[0][0])]
+            else:
+                results = self.send_batch([arguments for arguments, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch {self.tool_name} returned {len(results)} results "
+                        f"for {len(batch)} calls"
+                    )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, dict) and "error" in result:
+                future.set_exception(RuntimeError(result["error"]))
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Return batch counters and the average batch fill rate."""
+        with self._cond:
+            batches, items = self.batches, self.items
+        return {
+            "tool": self.tool_name,
+            "batches": batches,
+            "items": items,
+            "avg_batch_size": items / batches if batches else 0.0,
+            "fill_rate": items / (batches * self.max_size) if batches else 0.0,
+        }
+
+    def close(self):
+        """Flush pending calls and stop the collector and dispatch threads."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._dispatcher.shutdown(wait=True)
@@ -56,7 +56,7 @@ def test_agent_structure():
         assert 'job_description_path' in AgentState.__annotations__
         assert 'job_description_content' in AgentState.__annotations__
         assert 'formatted_job_description' in AgentState.__annotations__
-        assert 'tailored_resume' in AgentState.__annotations__
+        assert 'tailored_resumes' in AgentState.__annotations__
         assert 'status' in AgentState.__annotations__
         logger.info("✓ AgentState has all required fields")
         